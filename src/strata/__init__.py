@@ -1,5 +1,8 @@
 from . import _compat as _compat  # noqa: F401  -- Python 3.14 sqlglot workaround
 
+# Version is defined here and in pyproject.toml
+__version__ = "0.1.0"
+
 from .core import (
     AggFunction,
     Dataset,
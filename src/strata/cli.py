@@ -5,6 +5,7 @@ Define features in Python, run locally, scale to Databricks.
 
 from __future__ import annotations
 
+import contextvars
 import getpass
 import json as json_lib
 import logging
@@ -21,8 +22,8 @@ if TYPE_CHECKING:
 
 import cyclopts
 from loguru import logger
-from rich.console import Console
 
+import strata
 import strata.diff as diff
 import strata.discovery as discovery
 import strata.errors as errors
@@ -32,10 +33,19 @@ import strata.registry as reg_types
 import strata.settings as settings
 import strata.validation as validation
 
-# Version is defined here and in pyproject.toml
-__version__ = "0.1.0"
+__version__ = strata.__version__
 
-console = Console()
+console = output.make_console()
+
+# Directory holding strata.yaml. None means the process working directory;
+# embedders and tests set it instead of calling os.chdir().
+project_dir: contextvars.ContextVar[Path | None] = contextvars.ContextVar(
+    "strata_project_dir", default=None
+)
+
+# Rendered SQL reused across `strata compile` / `strata build` runs,
+# relative to the project root.
+_COMPILE_CACHE_DIR = Path(".strata") / "cache" / "compile"
 
 app = cyclopts.App(
     name="strata",
@@ -61,6 +71,38 @@ def _configure_verbose(verbose: bool) -> None:
         logger.enable("strata")
 
 
+def _config_path() -> Path:
+    """Path to strata.yaml, honouring the ``project_dir`` override."""
+    root = project_dir.get()
+    return root / "strata.yaml" if root is not None else Path("strata.yaml")
+
+
+def _load_settings(env: str | None = None) -> settings.StrataSettings:
+    """Load strata.yaml, honouring the ``project_dir`` override.
+
+    With an override, relative registry, backend and online store paths
+    are resolved against the project directory rather than the working
+    directory, as they would be when running from inside the project.
+    """
+    strata_settings = settings.load_strata_settings(_config_path(), env=env)
+    root = project_dir.get()
+    if root is None:
+        return strata_settings
+
+    environments = {}
+    for name, env_settings in strata_settings.environments.items():
+        update = {}
+        for field in ("registry", "backend", "online_store"):
+            component = getattr(env_settings, field)
+            path = getattr(component, "path", None)
+            if isinstance(path, str) and not Path(path).is_absolute():
+                update[field] = component.model_copy(
+                    update={"path": str(root / path)}
+                )
+        environments[name] = env_settings.model_copy(update=update)
+    return strata_settings.model_copy(update={"environments": environments})
+
+
 def _get_registry(
     strata_settings: settings.StrataSettings,
 ) -> infra.RegistryKind:
@@ -101,7 +143,7 @@ def env(
 ):
     """Show current environment or details of a specific environment."""
     try:
-        strata_settings = settings.load_strata_settings()
+        strata_settings = _load_settings()
 
         if name:
             # Show specific environment
@@ -134,7 +176,7 @@ def env(
 def env_list():
     """List all available environments."""
     try:
-        strata_settings = settings.load_strata_settings()
+        strata_settings = _load_settings()
         console.print("[bold]Environments:[/bold]")
         for name, env_settings in strata_settings.environments.items():
             marker = (
@@ -167,7 +209,7 @@ def preview(
     Shows what would be created, updated, or deleted when you run `strata up`.
     """
     try:
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
         console.print(
             f"[bold]Previewing changes for {strata_settings.active_env}[/bold]"
         )
@@ -220,7 +262,7 @@ def validate(
     """
     try:
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
 
         if not json_output:
             console.print(
@@ -346,7 +388,7 @@ def up(
     """
     try:
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
 
         # Discovery phase with timing telemetry
         t0 = time.perf_counter()
@@ -520,7 +562,7 @@ def build(
         import strata.build as build_mod
 
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
 
         # Validate schedule tag if provided
         if schedule:
@@ -663,7 +705,9 @@ def _write_build_compile_output(
     disc_by_name = {d.name: d for d in discovered if d.kind == "feature_table"}
     table_by_name = {ft.name: ft for ft in feature_tables}
 
-    ibis_compiler = compiler_mod.IbisCompiler()
+    ibis_compiler = compiler_mod.IbisCompiler(
+        persistent_cache_dir=project_root / _COMPILE_CACHE_DIR
+    )
 
     for table_name in successful:
         disc = disc_by_name.get(table_name)
@@ -678,6 +722,8 @@ def _write_build_compile_output(
                 output_dir=output_dir,
                 env=strata_settings.active_env,
                 strata_version=__version__,
+                # Debug-only artifact; `strata compile` still writes it
+                write_ibis_expr=False,
             )
         except Exception:
             logger.warning(
@@ -834,7 +880,7 @@ def compile(
         import strata.compiler as compiler_mod
 
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
         console.print(
             f"[bold]Compiling for {strata_settings.active_env}...[/bold]"
         )
@@ -875,7 +921,10 @@ def compile(
         )
         output_dir = project_root / ".strata" / "compiled"
 
-        ibis_compiler = compiler_mod.IbisCompiler()
+        ibis_compiler = compiler_mod.IbisCompiler(
+            persistent_cache_dir=project_root / _COMPILE_CACHE_DIR
+        )
+
         compiled_count = 0
 
         for disc in feature_tables:
@@ -944,7 +993,7 @@ def down(
         strata down --yes              # Remove all without confirmation
     """
     try:
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
 
         # Validate arguments: either both kind+name or neither
         if (kind is None) != (name is None):
@@ -1064,7 +1113,7 @@ def ls(
         strata ls feature_table      # List only feature tables
     """
     try:
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
 
         # Validate kind if provided
         if kind is not None and kind not in VALID_KINDS:
@@ -1168,7 +1217,7 @@ def quality(
     """
     try:
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
         reg = _get_registry(strata_settings)
         reg.initialize()
 
@@ -1464,7 +1513,7 @@ def freshness(
         import strata.freshness as freshness_mod
 
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
         reg = _get_registry(strata_settings)
         reg.initialize()
 
@@ -1684,7 +1733,7 @@ def publish(
     """
     try:
         _configure_verbose(verbose)
-        strata_settings = settings.load_strata_settings(env=env_name)
+        strata_settings = _load_settings(env_name)
 
         # Discover feature tables
         discovered = _discover(strata_settings, quiet=json_output)
@@ -18,6 +18,11 @@ import strata.discovery as discovery
 import strata.registry as reg_types
 
 
+def _json_bytes(data: dict[str, object]) -> bytes:
+    """Serialize to indented JSON, encoded once for a binary write."""
+    return json.dumps(data, indent=2).encode()
+
+
 def write_compile_output(
     compiled: compiler_mod.CompiledQuery,
     disc: discovery.DiscoveredObject,
@@ -26,12 +31,15 @@ def write_compile_output(
     env: str,
     strata_version: str,
     registry_serial: int | None = None,
+    write_ibis_expr: bool = True,
 ) -> Path:
     """Write enhanced compile output files for a single table.
 
     Creates the output directory and writes:
     - query.sql: The compiled SQL
     - ibis_expr.txt: String representation of the Ibis expression
+      (only when ``write_ibis_expr`` is set; otherwise a stale copy from
+      an earlier compile is removed)
     - lineage.json: Source table lineage
     - build_context.json: Build metadata
 
@@ -42,30 +50,16 @@ def write_compile_output(
         env: Active environment name.
         strata_version: Current strata version string.
         registry_serial: Optional registry serial number.
+        write_ibis_expr: Render the Ibis expression tree to ibis_expr.txt.
+            Rendering walks the whole tree, so callers that never read
+            the file can skip it.
 
     Returns:
         Path to the table output directory.
     """
-    table_dir = output_dir / compiled.table_name
-    table_dir.mkdir(parents=True, exist_ok=True)
-
     # Serialize spec once for reuse
     spec = discovery.serialize_to_spec(disc.obj, disc.kind)
 
-    # Write query.sql
-    query_path = table_dir / "query.sql"
-    query_path.write_text(
-        f"-- Compiled from {disc.source_file}\n"
-        f"-- Feature table: {compiled.table_name}\n"
-        f"--\n"
-        f"{compiled.sql}\n"
-    )
-
-    # Write ibis_expr.txt
-    ibis_path = table_dir / "ibis_expr.txt"
-    ibis_path.write_text(str(compiled.ibis_expr))
-
-    # Write lineage.json
     lineage = {
         "table": compiled.table_name,
         "source_file": disc.source_file,
@@ -75,10 +69,7 @@ def write_compile_output(
         "aggregates": [a["name"] for a in spec.get("aggregates", [])],
         "custom_features": [f["name"] for f in spec.get("custom_features", [])],
     }
-    lineage_path = table_dir / "lineage.json"
-    lineage_path.write_text(json.dumps(lineage, indent=2))
 
-    # Write build_context.json
     spec_json = discovery.spec_to_json(spec)
     table_spec_hash = reg_types.compute_spec_hash(spec_json)[:8]
     build_context = {
@@ -89,7 +80,27 @@ def write_compile_output(
         "env": env,
         "source": spec.get("source"),
     }
-    context_path = table_dir / "build_context.json"
-    context_path.write_text(json.dumps(build_context, indent=2))
+
+    # Render every file up front, then write them back-to-back
+    outputs = {
+        "query.sql": (
+            f"-- Compiled from {disc.source_file}\n"
+            f"-- Feature table: {compiled.table_name}\n"
+            f"--\n"
+            f"{compiled.sql}\n"
+        ).encode(),
+        "lineage.json": _json_bytes(lineage),
+        "build_context.json": _json_bytes(build_context),
+    }
+    if write_ibis_expr:
+        outputs["ibis_expr.txt"] = str(compiled.ibis_expr).encode()
+
+    table_dir = output_dir / compiled.table_name
+    table_dir.mkdir(parents=True, exist_ok=True)
+    for filename, data in outputs.items():
+        (table_dir / filename).write_bytes(data)
+    if not write_ibis_expr:
+        # Don't leave an expression that no longer matches query.sql
+        (table_dir / "ibis_expr.txt").unlink(missing_ok=True)
 
     return table_dir
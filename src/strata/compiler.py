@@ -6,14 +6,23 @@ The compiler is backend-agnostic -- it builds expressions, not connections.
 
 from __future__ import annotations
 
+import contextlib
 import dataclasses
+import functools
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Mapping
 from datetime import timedelta
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import ibis
 import ibis.expr.datatypes as dt
 import ibis.expr.types as ir
 
+import strata
+
 if TYPE_CHECKING:
     import strata.core as core
 
@@ -51,29 +60,246 @@ class CompiledQuery:
     source_tables: list[str]
 
 
+# Upper bound on memoized compilations kept across compiler instances.
+_COMPILE_CACHE_SIZE = 256
+
+# Bump when the persistent cache file layout changes. Entries written by
+# another format, Ibis version or strata version are ignored and
+# overwritten.
+_PERSISTENT_CACHE_FORMAT = 1
+
+# Entries kept in a persistent cache directory. The least recently
+# written ones are removed once a write pushes the count past this.
+_PERSISTENT_CACHE_MAX_ENTRIES = 1024
+
+# Source schema frozen to (column, dtype) pairs. Column order is kept:
+# it determines the column order of the source table expression.
+_SchemaItems = tuple[tuple[str, str], ...]
+
+
+class _CompileRequest:
+    """A compile_table() call, hashed and compared by its cache key.
+
+    Lets ``functools.lru_cache`` memoize on the key while still handing
+    the (unhashable) FeatureTable and the compiler through. The key
+    includes the compiler class and its persistent cache directory, so
+    subclasses and differently configured compilers never share entries.
+    """
+
+    __slots__ = ("key", "compiler", "table", "source_schema", "date_range")
+
+    def __init__(
+        self,
+        key: tuple[object, ...],
+        compiler: IbisCompiler,
+        table: core.FeatureTable,
+        source_schema: _SchemaItems | None,
+        date_range: tuple[object, object] | None,
+    ) -> None:
+        self.key = (type(compiler), compiler.persistent_cache_dir, key)
+        self.compiler = compiler
+        self.table = table
+        self.source_schema = source_schema
+        self.date_range = date_range
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _CompileRequest) and self.key == other.key
+
+
+def _compile_key(
+    table: core.FeatureTable,
+    source_schema: _SchemaItems | None,
+    date_range: tuple[object, object] | None,
+) -> tuple[object, ...] | None:
+    """Build a cache key from everything that shapes the compiled query.
+
+    Transforms and custom features are keyed on the function objects
+    themselves, so only a table reusing the very same callables hits the
+    cache. Returns None when a component is unhashable.
+    """
+    import strata.core as core_module
+
+    if isinstance(table.source, core_module.FeatureTable):
+        source_name = table.source.name
+    else:
+        source_name = table.source_name
+
+    key = (
+        table.name,
+        source_name,
+        tuple(table.entity.join_keys),
+        table.timestamp_field,
+        tuple(
+            (a["name"], a["column"], a["function"], a["window"])
+            for a in table._aggregates
+        ),
+        tuple(table._transforms),
+        tuple((c["name"], c["func"]) for c in table._custom_features),
+        source_schema,
+        date_range,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+@functools.lru_cache(maxsize=64)
+def _to_ibis_schema(source_schema: _SchemaItems) -> ibis.Schema:
+    """Convert frozen (column, dtype) pairs to an Ibis schema, once each.
+
+    Unknown dtypes fall back to string.
+    """
+    return ibis.schema(
+        {col: _DTYPE_MAP.get(dtype, dt.string) for col, dtype in source_schema}
+    )
+
+
+def _freeze_schema(
+    source_schema: Mapping[str, str] | Iterable[tuple[str, str]] | None,
+) -> _SchemaItems | None:
+    """Normalize a source schema to hashable (column, dtype) pairs."""
+    if source_schema is None:
+        return None
+    if isinstance(source_schema, Mapping):
+        return tuple(source_schema.items())
+    return tuple(source_schema)
+
+
+def clear_compile_cache() -> None:
+    """Drop all memoized compile_table() results.
+
+    Persistent cache files are left alone; delete the directory to drop
+    them.
+    """
+    _compile_cached.cache_clear()
+
+
+def _persistent_cache_path(
+    cache_dir: Path,
+    compiler_cls: type[IbisCompiler],
+    table: core.FeatureTable,
+    source_schema: _SchemaItems | None,
+    date_range: tuple[object, object] | None,
+) -> Path | None:
+    """Locate the on-disk SQL entry for a compile, if it can have one.
+
+    Keyed on the same fields as the in-memory cache (``_compile_key``),
+    read from the live table, plus the compiler class. Tables with
+    transforms or custom features are skipped: function objects have no
+    stable representation across processes.
+    """
+    if table._transforms or table._custom_features:
+        return None
+    key = _compile_key(table, source_schema, date_range)
+    if key is None:
+        return None
+    cls_name = f"{compiler_cls.__module__}.{compiler_cls.__qualname__}"
+    digest = hashlib.sha256(repr((cls_name, key)).encode()).hexdigest()
+    return cache_dir / f"{digest}.json"
+
+
+def _read_persistent_sql(path: Path) -> str | None:
+    """Return the cached SQL at ``path``, or None if missing or stale."""
+    try:
+        entry = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(entry, dict)
+        or entry.get("format") != _PERSISTENT_CACHE_FORMAT
+        or entry.get("ibis_version") != ibis.__version__
+        or entry.get("strata_version") != strata.__version__
+        or not isinstance(entry.get("sql"), str)
+    ):
+        return None
+    return entry["sql"]
+
+
+def _write_persistent_sql(path: Path, sql: str) -> None:
+    """Write a cache entry atomically so readers never see partial files.
+
+    The cache is an optimisation: if the directory cannot be written
+    (read-only or full disk) the entry is skipped rather than failing
+    the compile.
+    """
+    entry = {
+        "format": _PERSISTENT_CACHE_FORMAT,
+        "ibis_version": ibis.__version__,
+        "strata_version": strata.__version__,
+        "sql": sql,
+    }
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(json.dumps(entry).encode())
+        os.replace(tmp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        return
+    _prune_persistent_cache(path.parent)
+
+
+def _prune_persistent_cache(cache_dir: Path) -> None:
+    """Drop the oldest entries once the directory exceeds its cap."""
+    try:
+        entries = [(p.stat().st_mtime_ns, p) for p in cache_dir.glob("*.json")]
+    except OSError:
+        return
+    excess = len(entries) - _PERSISTENT_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+    entries.sort()
+    for _, entry_path in entries[:excess]:
+        with contextlib.suppress(OSError):
+            entry_path.unlink(missing_ok=True)
+
+
 class IbisCompiler:
     """Compiles FeatureTable definitions to Ibis expressions and SQL.
 
-    Stateless compiler -- does not manage backend connections.
+    Does not manage backend connections.
     Builds Ibis expression trees from FeatureTable definitions and
-    renders them to SQL using the DuckDB dialect.
+    renders them to SQL using the DuckDB dialect. Results are memoized
+    module-wide per compiler class, so recompiling an unchanged table
+    reuses the same Ibis expression and SQL.
+
+    Args:
+        persistent_cache_dir: Optional directory for rendered SQL that
+            outlives the process (e.g. ``.strata_cache``). A later run
+            compiling an unchanged table rebuilds the Ibis expression
+            but skips SQL rendering. The directory holds at most
+            ``_PERSISTENT_CACHE_MAX_ENTRIES`` entries; older ones are
+            removed as new ones are written.
     """
 
+    def __init__(self, persistent_cache_dir: Path | None = None) -> None:
+        self.persistent_cache_dir = persistent_cache_dir
+
     def compile_table(
         self,
         table: core.FeatureTable,
-        source_schema: dict[str, str] | None = None,
+        source_schema: Mapping[str, str]
+        | Iterable[tuple[str, str]]
+        | None = None,
         date_range: tuple[object, object] | None = None,
     ) -> CompiledQuery:
         """Compile a FeatureTable into a CompiledQuery.
 
         Args:
             table: The FeatureTable to compile.
-            source_schema: Optional column-name-to-dtype mapping from the
-                actual data source. When provided (e.g. by the build engine),
-                the compiler uses the real schema instead of inferring one.
-                Keys are column names, values are strata dtype strings
+            source_schema: Optional column-name-to-dtype mapping (or
+                ``(column, dtype)`` pairs) from the actual data source.
+                When provided (e.g. by the build engine), the compiler uses
+                the real schema instead of inferring one. Keys are column
+                names, values are strata dtype strings
                 (e.g. ``{"user_id": "string", "amount": "float64"}``).
+                Frozen to a tuple once, in column order, for the cache key.
             date_range: Optional (start, end) tuple for filtering source data
                 by the table's timestamp_field. Applied before transforms and
                 aggregation so that the timestamp column is still available.
@@ -83,6 +309,25 @@ class IbisCompiler:
             CompiledQuery with SQL, Ibis expression, table name,
             and list of source table names.
         """
+        schema_items = _freeze_schema(source_schema)
+        key = _compile_key(table, schema_items, date_range)
+        if key is None:
+            return self._compile(table, schema_items, date_range)
+        cached = _compile_cached(
+            _CompileRequest(key, self, table, schema_items, date_range)
+        )
+        # Hand out a fresh list so callers cannot alter the cached entry.
+        return dataclasses.replace(
+            cached, source_tables=list(cached.source_tables)
+        )
+
+    def _compile(
+        self,
+        table: core.FeatureTable,
+        source_schema: _SchemaItems | None,
+        date_range: tuple[object, object] | None,
+    ) -> CompiledQuery:
+        """Compile without consulting the cache."""
         expr = self._build_expression(
             table, source_schema=source_schema, date_range=date_range
         )
@@ -94,8 +339,23 @@ class IbisCompiler:
         else:
             source_tables = [table.source_name]
 
+        cache_path = None
+        if self.persistent_cache_dir is not None:
+            cache_path = _persistent_cache_path(
+                self.persistent_cache_dir,
+                type(self),
+                table,
+                source_schema,
+                date_range,
+            )
+        sql = _read_persistent_sql(cache_path) if cache_path else None
+        if sql is None:
+            sql = ibis.to_sql(expr, dialect="duckdb")
+            if cache_path is not None:
+                _write_persistent_sql(cache_path, sql)
+
         return CompiledQuery(
-            sql=ibis.to_sql(expr, dialect="duckdb"),
+            sql=sql,
             ibis_expr=expr,
             table_name=table.name,
             source_tables=source_tables,
@@ -104,7 +364,7 @@ class IbisCompiler:
     def _build_expression(
         self,
         table: core.FeatureTable,
-        source_schema: dict[str, str] | None = None,
+        source_schema: _SchemaItems | None = None,
         date_range: tuple[object, object] | None = None,
     ) -> ir.Table:
         """Build an Ibis expression tree from a FeatureTable.
@@ -114,11 +374,9 @@ class IbisCompiler:
         import strata.core as core_module
 
         # Build source expression
+        schema: ibis.Schema | dict[str, dt.DataType]
         if source_schema is not None:
-            schema = {
-                col: _DTYPE_MAP.get(dtype, dt.string)
-                for col, dtype in source_schema.items()
-            }
+            schema = _to_ibis_schema(source_schema)
         else:
             schema = self._infer_schema(table)
 
@@ -222,3 +480,11 @@ class IbisCompiler:
             group_keys + [ts_field] + [a["name"] for a in table._aggregates]
         )
         return expr.select(output_cols).distinct()
+
+
+@functools.lru_cache(maxsize=_COMPILE_CACHE_SIZE)
+def _compile_cached(request: _CompileRequest) -> CompiledQuery:
+    """Compile once per distinct cache key."""
+    return request.compiler._compile(
+        request.table, request.source_schema, request.date_range
+    )
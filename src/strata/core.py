@@ -429,6 +429,9 @@ class Dataset(StrataBaseModel):
     def validate_no_duplicate_columns(self) -> "Dataset":
         """Ensure no duplicate output column names."""
         columns = self.output_columns()
+        if len(set(columns)) == len(columns):
+            return self
+        # Only rescan to name the first duplicate once one is known to exist
         seen = set()
         for col in columns:
             if col in seen:
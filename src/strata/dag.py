@@ -8,8 +8,12 @@ Builds a dependency graph from FeatureTable definitions and provides:
 
 from __future__ import annotations
 
+import sys
+import types
+from collections import deque
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 import strata.errors as errors
 
@@ -17,7 +21,7 @@ if TYPE_CHECKING:
     import strata.core as core
 
 
-@dataclass
+@dataclass(slots=True)
 class DAGNode:
     """A node in the feature table dependency graph."""
 
@@ -25,6 +29,16 @@ class DAGNode:
     table: core.FeatureTable
     upstream: list[str] = field(default_factory=list)
     downstream: list[str] = field(default_factory=list)
+    # Mirrors ``downstream`` for O(1) duplicate checks in add_downstream()
+    _downstream_set: set[str] = field(
+        default_factory=set, repr=False, compare=False
+    )
+
+    def add_downstream(self, name: str) -> None:
+        """Record ``name`` as a dependent, keeping insertion order."""
+        if name not in self._downstream_set:
+            self._downstream_set.add(name)
+            self.downstream.append(name)
 
 
 class DAG:
@@ -42,6 +56,10 @@ class DAG:
 
     def __init__(self) -> None:
         self._nodes: dict[str, DAGNode] = {}
+        # topological_sort() result and the reachability bitsets built on
+        # it, computed lazily and reset whenever a table is added
+        self._topo_order: list[str] | None = None
+        self._reach: _Reachability | None = None
 
     def add_table(self, table: core.FeatureTable) -> None:
         """Add a single FeatureTable to the DAG.
@@ -49,48 +67,63 @@ class DAG:
         Resolves upstream dependencies if the table's source
         is another FeatureTable.
         """
-        import strata.core as core
-
-        upstream: list[str] = []
-        if isinstance(table.source, core.FeatureTable):
-            upstream.append(table.source.name)
-
-        self._nodes[table.name] = DAGNode(
-            name=table.name,
-            table=table,
-            upstream=upstream,
-        )
+        node = self._insert_node(table)
 
         # Update downstream references for existing nodes
-        for dep_name in upstream:
+        for dep_name in node.upstream:
             if dep_name in self._nodes:
-                if table.name not in self._nodes[dep_name].downstream:
-                    self._nodes[dep_name].downstream.append(table.name)
+                self._nodes[dep_name].add_downstream(node.name)
 
     def add_tables(self, tables: list[core.FeatureTable]) -> None:
         """Add multiple FeatureTables to the DAG.
 
-        Performs a second pass to resolve all downstream references
-        after all tables are added.
+        Inserts every node first, then wires all downstream references
+        in a single pass, so the input order does not matter.
         """
         for table in tables:
-            self.add_table(table)
+            self._insert_node(table)
 
-        # Second pass: ensure all downstream references are resolved
         for node in self._nodes.values():
             for dep_name in node.upstream:
                 if dep_name in self._nodes:
-                    if node.name not in self._nodes[dep_name].downstream:
-                        self._nodes[dep_name].downstream.append(node.name)
+                    self._nodes[dep_name].add_downstream(node.name)
+
+    def _insert_node(self, table: core.FeatureTable) -> DAGNode:
+        """Store a node for ``table`` with its upstream resolved.
+
+        Downstream references are left to the caller. Resets the cached
+        topological order.
+        """
+        import strata.core as core
+
+        self._topo_order = None
+        self._reach = None
+        # Interned so every key comparison in the graph can short-circuit
+        # on identity
+        name = sys.intern(table.name)
+        upstream: list[str] = []
+        if isinstance(table.source, core.FeatureTable):
+            upstream.append(sys.intern(table.source.name))
+
+        node = DAGNode(name=name, table=table, upstream=upstream)
+        self._nodes[name] = node
+        return node
 
     def topological_sort(self) -> list[str]:
         """Return table names in execution order (dependencies first).
 
-        Uses Kahn's algorithm for deterministic ordering.
+        Uses Kahn's algorithm for deterministic ordering. The order is
+        cached until the next add_table(); callers get their own copy.
 
         Raises:
             StrataError: If a cycle is detected in the dependency graph.
         """
+        if self._topo_order is None:
+            self._topo_order = self._kahn_order()
+        return list(self._topo_order)
+
+    def _kahn_order(self) -> list[str]:
+        """Compute the topological order from scratch."""
         in_degree: dict[str, int] = {}
         for name, node in self._nodes.items():
             # Only count upstream deps that are actually in the DAG
@@ -98,31 +131,106 @@ class DAG:
                 1 for dep in node.upstream if dep in self._nodes
             )
 
-        queue = sorted(
-            name for name, degree in in_degree.items() if degree == 0
+        # Roots in name order, then each node's dependents in name order
+        # as they become ready: O(V + E) apart from the per-node sorts.
+        ready = deque(
+            sorted(name for name, degree in in_degree.items() if degree == 0)
         )
         result: list[str] = []
 
-        while queue:
-            name = queue.pop(0)
+        while ready:
+            name = ready.popleft()
             result.append(name)
 
             for downstream in sorted(self._nodes[name].downstream):
                 if downstream in in_degree:
                     in_degree[downstream] -= 1
                     if in_degree[downstream] == 0:
-                        queue.append(downstream)
+                        ready.append(downstream)
 
         if len(result) != len(self._nodes):
-            remaining = set(self._nodes.keys()) - set(result)
+            remaining = {
+                name for name, degree in in_degree.items() if degree > 0
+            }
+            cycles = "; ".join(
+                " -> ".join(cycle) for cycle in self._find_cycles(remaining)
+            )
             raise errors.StrataError(
                 context="Building DAG execution order",
-                cause=f"Cycle detected involving tables: {', '.join(sorted(remaining))}",
+                cause=f"Cycle detected: {cycles}",
                 fix="Remove circular dependencies between feature tables.",
             )
 
         return result
 
+    def _find_cycles(self, names: set[str]) -> list[list[str]]:
+        """Return one closed path per cycle among ``names``.
+
+        ``names`` are the tables Kahn's algorithm could not order. Runs an
+        iterative Tarjan SCC pass over them in O(V + E); tables that only
+        sit downstream of a cycle form singleton components and are
+        skipped. Each path is closed by repeating its first table.
+        """
+
+        def successors(name: str) -> list[str]:
+            return sorted(d for d in self._nodes[name].downstream if d in names)
+
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[set[str]] = []
+
+        for root in sorted(names):
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors(root)))]
+            while work:
+                name, pending = work[-1]
+                for succ in pending:
+                    if succ not in index:
+                        index[succ] = low[succ] = len(index)
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(successors(succ))))
+                        break
+                    if succ in on_stack:
+                        low[name] = min(low[name], index[succ])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[name])
+                    if low[name] == index[name]:
+                        component: set[str] = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == name:
+                                break
+                        components.append(component)
+
+        cycles: list[list[str]] = []
+        for component in components:
+            start = min(component)
+            if len(component) == 1 and start not in successors(start):
+                continue
+            # Follow edges inside the component until a table repeats
+            path = [start]
+            position = {start: 0}
+            while True:
+                succ = min(d for d in successors(path[-1]) if d in component)
+                if succ in position:
+                    cycles.append(path[position[succ] :] + [succ])
+                    break
+                position[succ] = len(path)
+                path.append(succ)
+        return sorted(cycles)
+
     def get_upstream(
         self, table_name: str, *, include_self: bool = True
     ) -> list[str]:
@@ -142,24 +250,13 @@ class DAG:
                 fix=f"Ensure '{table_name}' is registered in the DAG.",
             )
 
-        visited: set[str] = set()
-        result: list[str] = []
-
-        def _visit(name: str) -> None:
-            if name in visited:
-                return
-            visited.add(name)
-            if name in self._nodes:
-                for upstream in self._nodes[name].upstream:
-                    _visit(upstream)
-            result.append(name)
-
-        _visit(table_name)
-
-        if not include_self:
-            result.remove(table_name)
-
-        return result
+        try:
+            reach = self._reachability()
+        except errors.StrataError:
+            return self._walk(table_name, "upstream", include_self)
+        return reach.names(
+            reach.ancestors[table_name], table_name, include_self
+        )
 
     def get_downstream(
         self, table_name: str, *, include_self: bool = True
@@ -180,25 +277,88 @@ class DAG:
                 fix=f"Ensure '{table_name}' is registered in the DAG.",
             )
 
-        visited: set[str] = set()
-        result: list[str] = []
-
-        def _visit(name: str) -> None:
-            if name in visited:
-                return
-            visited.add(name)
-            result.append(name)
-            if name in self._nodes:
-                for downstream in self._nodes[name].downstream:
-                    _visit(downstream)
-
-        _visit(table_name)
+        try:
+            reach = self._reachability()
+        except errors.StrataError:
+            return self._walk(table_name, "downstream", include_self)
+        return reach.names(
+            reach.descendants[table_name], table_name, include_self
+        )
 
+    def _walk(
+        self,
+        table_name: str,
+        direction: Literal["upstream", "downstream"],
+        include_self: bool,
+    ) -> list[str]:
+        """Collect a closure with a breadth-first walk from ``table_name``.
+
+        Fallback for graphs with a cycle, which have no topological order
+        to build reachability on. Only tables reachable from
+        ``table_name`` are visited, so a cycle elsewhere does not affect
+        the answer. Each table has at most one upstream, so the upstream
+        walk is a chain (reversed to put dependencies first) and the
+        downstream walk visits parents before children.
+        """
+        result = [table_name]
+        seen = {table_name}
+        queue = deque(result)
+        while queue:
+            node = self._nodes.get(queue.popleft())
+            if node is None:
+                continue
+            for name in getattr(node, direction):
+                if name not in seen:
+                    seen.add(name)
+                    result.append(name)
+                    queue.append(name)
+
+        if direction == "upstream":
+            result.reverse()
         if not include_self:
             result.remove(table_name)
-
         return result
 
+    def _reachability(self) -> _Reachability:
+        """Build (once per change) every table's ancestor/descendant bitset.
+
+        Bits are assigned in topological order, after any dependencies
+        that are not registered in the DAG, which take the lowest bits in
+        name order. Each mask is the union of its direct neighbours' bits
+        and masks, so one pass in each direction fills them all.
+        """
+        if self._reach is None:
+            if self._topo_order is None:
+                self._topo_order = self._kahn_order()
+            order = self._topo_order
+            external = sorted(
+                {
+                    dep
+                    for node in self._nodes.values()
+                    for dep in node.upstream
+                    if dep not in self._nodes
+                }
+            )
+            by_bit = external + order
+            bit = {name: 1 << i for i, name in enumerate(by_bit)}
+
+            ancestors: dict[str, int] = {}
+            for name in order:
+                mask = 0
+                for dep in self._nodes[name].upstream:
+                    mask |= bit[dep] | ancestors.get(dep, 0)
+                ancestors[name] = mask
+
+            descendants: dict[str, int] = {}
+            for name in reversed(order):
+                mask = 0
+                for child in self._nodes[name].downstream:
+                    mask |= bit.get(child, 0) | descendants.get(child, 0)
+                descendants[name] = mask
+
+            self._reach = _Reachability(by_bit, bit, ancestors, descendants)
+        return self._reach
+
     def get_table(self, name: str) -> core.FeatureTable:
         """Retrieve a FeatureTable by name.
 
@@ -214,12 +374,35 @@ class DAG:
         return self._nodes[name].table
 
     @property
-    def nodes(self) -> dict[str, DAGNode]:
-        """Read-only access to the internal nodes dictionary."""
-        return dict(self._nodes)
+    def nodes(self) -> Mapping[str, DAGNode]:
+        """Read-only live view of the internal nodes dictionary."""
+        return types.MappingProxyType(self._nodes)
 
     def __len__(self) -> int:
         return len(self._nodes)
 
     def __contains__(self, name: str) -> bool:
         return name in self._nodes
+
+
+@dataclass(slots=True)
+class _Reachability:
+    """Transitive closure of a DAG as one int bitset per table."""
+
+    by_bit: list[str]
+    bit: dict[str, int]
+    ancestors: dict[str, int]
+    descendants: dict[str, int]
+
+    def names(
+        self, mask: int, table_name: str, include_self: bool
+    ) -> list[str]:
+        """Expand ``mask`` to table names, lowest bit (earliest) first."""
+        if include_self:
+            mask |= self.bit[table_name]
+        result: list[str] = []
+        while mask:
+            lowest = mask & -mask
+            result.append(self.by_bit[lowest.bit_length() - 1])
+            mask ^= lowest
+        return result
@@ -5,6 +5,8 @@ Computes changes needed to sync Python definitions to registry.
 
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
@@ -25,7 +27,7 @@ class ChangeOperation(str, Enum):
     UNCHANGED = "unchanged"
 
 
-@dataclass
+@dataclass(slots=True)
 class Change:
     """Represents a single change in the diff.
 
@@ -48,6 +50,15 @@ class Change:
     source_file: str | None = None
 
 
+# Summary wording per operation, in display order
+_SUMMARY_LABELS: tuple[tuple[ChangeOperation, str], ...] = (
+    (ChangeOperation.CREATE, "created"),
+    (ChangeOperation.UPDATE, "updated"),
+    (ChangeOperation.DELETE, "deleted"),
+    (ChangeOperation.UNCHANGED, "unchanged"),
+)
+
+
 @dataclass
 class DiffResult:
     """Result of computing a diff.
@@ -81,22 +92,28 @@ class DiffResult:
             c for c in self.changes if c.operation == ChangeOperation.UNCHANGED
         ]
 
+    @property
+    def unchanged_count(self) -> int:
+        """Number of objects whose spec matches the registry."""
+        return sum(
+            1 for c in self.changes if c.operation == ChangeOperation.UNCHANGED
+        )
+
     @property
     def has_changes(self) -> bool:
         """True if there are any creates, updates, or deletes."""
-        return bool(self.creates or self.updates or self.deletes)
+        return any(
+            c.operation != ChangeOperation.UNCHANGED for c in self.changes
+        )
 
     def summary(self) -> str:
         """Return summary string like '3 created, 1 updated, 0 deleted'."""
-        parts = []
-        if self.creates:
-            parts.append(f"{len(self.creates)} created")
-        if self.updates:
-            parts.append(f"{len(self.updates)} updated")
-        if self.deletes:
-            parts.append(f"{len(self.deletes)} deleted")
-        if self.unchanged:
-            parts.append(f"{len(self.unchanged)} unchanged")
+        counts = Counter(c.operation for c in self.changes)
+        parts = [
+            f"{counts[operation]} {label}"
+            for operation, label in _SUMMARY_LABELS
+            if counts[operation]
+        ]
         return ", ".join(parts) if parts else "No changes"
 
 
@@ -113,85 +130,100 @@ def compute_diff(
     Returns:
         DiffResult with all changes
     """
-    changes: list[Change] = []
+    changes = list(iter_changes(discovered, reg))
+
+    # Sort changes for deterministic output: by kind, then name
+    changes.sort(key=lambda c: (c.kind, c.name))
+
+    return DiffResult(changes=changes)
+
+
+def iter_changes(
+    discovered: Iterable[discovery.DiscoveredObject],
+    reg: "base.BaseRegistry",
+) -> Iterator[Change]:
+    """Yield changes one at a time, discovered objects first, then deletes.
+
+    Unsorted; compute_diff() collects and orders them.
 
+    Args:
+        discovered: Discovered definitions from Python files
+        reg: Registry backend to compare against
+    """
     # Build map of current state: (kind, name) -> ObjectRecord
-    current_objects = reg.list_objects()
     current_map: dict[tuple[str, str], registry.ObjectRecord] = {
-        (obj.kind, obj.name): obj for obj in current_objects
+        (obj.kind, obj.name): obj for obj in reg.list_objects()
     }
 
     # Track which objects we've seen (to detect deletes)
     seen_keys: set[tuple[str, str]] = set()
 
+    # Specs serialized during this diff, keyed by id() of the object. The
+    # object is kept in the value so its id cannot be reused meanwhile.
+    specs: dict[int, tuple[object, str, str]] = {}
+
     # Process each discovered object
     for disc in discovered:
         key = (disc.kind, disc.name)
         seen_keys.add(key)
 
-        # Serialize to canonical JSON
-        spec = discovery.serialize_to_spec(disc.obj, disc.kind)
-        spec_json = discovery.spec_to_json(spec)
-        new_hash = registry.compute_spec_hash(spec_json)
+        # Always hash the live object. Reusing a hash because its source
+        # file is unchanged would miss edits to anything it imports
+        # (shared fields, windows, source names, settings).
+        cached = specs.get(id(disc.obj))
+        if cached is None:
+            spec = discovery.serialize_to_spec(disc.obj, disc.kind)
+            spec_json = discovery.spec_to_json(spec)
+            new_hash = registry.compute_spec_hash(spec_json)
+            specs[id(disc.obj)] = (disc.obj, spec_json, new_hash)
+        else:
+            _, spec_json, new_hash = cached
 
         current = current_map.get(key)
 
         if current is None:
             # New object - CREATE
-            changes.append(
-                Change(
-                    operation=ChangeOperation.CREATE,
-                    kind=disc.kind,
-                    name=disc.name,
-                    old_hash=None,
-                    new_hash=new_hash,
-                    spec_json=spec_json,
-                    source_file=disc.source_file,
-                )
+            yield Change(
+                operation=ChangeOperation.CREATE,
+                kind=disc.kind,
+                name=disc.name,
+                old_hash=None,
+                new_hash=new_hash,
+                spec_json=spec_json,
+                source_file=disc.source_file,
             )
         elif current.spec_hash != new_hash:
             # Existing object with different hash - UPDATE
-            changes.append(
-                Change(
-                    operation=ChangeOperation.UPDATE,
-                    kind=disc.kind,
-                    name=disc.name,
-                    old_hash=current.spec_hash,
-                    new_hash=new_hash,
-                    spec_json=spec_json,
-                    source_file=disc.source_file,
-                )
+            yield Change(
+                operation=ChangeOperation.UPDATE,
+                kind=disc.kind,
+                name=disc.name,
+                old_hash=current.spec_hash,
+                new_hash=new_hash,
+                spec_json=spec_json,
+                source_file=disc.source_file,
             )
         else:
             # Same hash - UNCHANGED
-            changes.append(
-                Change(
-                    operation=ChangeOperation.UNCHANGED,
-                    kind=disc.kind,
-                    name=disc.name,
-                    old_hash=current.spec_hash,
-                    new_hash=new_hash,
-                    spec_json=spec_json,
-                    source_file=disc.source_file,
-                )
+            yield Change(
+                operation=ChangeOperation.UNCHANGED,
+                kind=disc.kind,
+                name=disc.name,
+                old_hash=current.spec_hash,
+                new_hash=new_hash,
+                spec_json=spec_json,
+                source_file=disc.source_file,
             )
 
     # Find deletes: objects in registry but not in discovered
-    for key, obj in current_map.items():
-        if key not in seen_keys:
-            changes.append(
-                Change(
-                    operation=ChangeOperation.DELETE,
-                    kind=obj.kind,
-                    name=obj.name,
-                    old_hash=obj.spec_hash,
-                    new_hash=None,
-                    spec_json=None,
-                    source_file=None,
-                )
-            )
-
-    # Sort changes for deterministic output: by kind, then name
-    changes.sort(key=lambda c: (c.kind, c.name))
-
-    return DiffResult(changes=changes)
+    for key in current_map.keys() - seen_keys:
+        obj = current_map[key]
+        yield Change(
+            operation=ChangeOperation.DELETE,
+            kind=obj.kind,
+            name=obj.name,
+            old_hash=obj.spec_hash,
+            new_hash=None,
+            spec_json=None,
+            source_file=None,
+        )
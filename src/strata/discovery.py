@@ -9,10 +9,13 @@ changing consumer code. Current implementation has NO caching - measure first.
 
 from __future__ import annotations
 
+import contextvars
 import fnmatch
+import importlib.abc
 import importlib.util
 import json
 import sys
+import types
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -21,7 +24,7 @@ import strata.core as core
 import strata.settings as settings
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveredObject:
     """A discovered feature definition."""
 
@@ -200,39 +203,95 @@ class DefinitionDiscoverer:
 
         module = importlib.util.module_from_spec(spec)
         sys.modules[module_name] = module
-
-        # Map SDK types to their kind names
-        sdk_types = {
-            core.Entity: "entity",
-            core.FeatureTable: "feature_table",
-            core.SourceTable: "source_table",
-            core.Dataset: "dataset",
-        }
-
-        discovered: list[DiscoveredObject] = []
         try:
             spec.loader.exec_module(module)
+            return _collect_sdk_objects(module, py_file)
+        finally:
+            del sys.modules[module_name]
 
-            for name in dir(module):
-                if name.startswith("_"):
-                    continue
-                obj = getattr(module, name)
-
-                for sdk_type, kind in sdk_types.items():
-                    if isinstance(obj, sdk_type):
-                        discovered.append(
-                            DiscoveredObject(
-                                kind=kind,
-                                name=obj.name,
-                                obj=obj,
-                                source_file=str(py_file),
-                            )
-                        )
-                        break
+    def _extract_from_source(
+        self, source: str, fake_path: Path
+    ) -> list[DiscoveredObject]:
+        """Execute module source text and extract SDK objects.
+
+        Mirrors ``_extract_from_module`` without touching the filesystem;
+        ``fake_path`` stands in for the file in tracebacks and
+        ``source_file``.
+        """
+        module_name = f"_strata_discovery_{fake_path.stem}_{id(source)}"
+
+        loader = _SourceLoader(source, fake_path)
+        spec = importlib.util.spec_from_loader(
+            module_name, loader, origin=str(fake_path)
+        )
+        if spec is None:
+            return []
+
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            loader.exec_module(module)
+            return _collect_sdk_objects(module, fake_path)
         finally:
             del sys.modules[module_name]
 
-        return discovered
+
+class _SourceLoader(importlib.abc.InspectLoader):
+    """Loader serving module code from in-memory source text."""
+
+    def __init__(self, source: str, path: Path) -> None:
+        self._source = source
+        self._path = path
+
+    def get_source(self, fullname: str) -> str:
+        return self._source
+
+    def get_code(self, fullname: str) -> types.CodeType:
+        return self.source_to_code(self._source, str(self._path))
+
+    def is_package(self, fullname: str) -> bool:
+        return False
+
+
+# Map SDK types to their kind names
+_SDK_KINDS: dict[type, str] = {
+    core.Entity: "entity",
+    core.FeatureTable: "feature_table",
+    core.SourceTable: "source_table",
+    core.Dataset: "dataset",
+}
+
+
+def _collect_sdk_objects(
+    module: types.ModuleType, source_file: Path
+) -> list[DiscoveredObject]:
+    """Return the public SDK objects defined in an executed module."""
+    discovered: list[DiscoveredObject] = []
+    for name in dir(module):
+        if name.startswith("_"):
+            continue
+        obj = getattr(module, name)
+
+        for sdk_type, kind in _SDK_KINDS.items():
+            if isinstance(obj, sdk_type):
+                discovered.append(
+                    DiscoveredObject(
+                        kind=kind,
+                        name=obj.name,
+                        obj=obj,
+                        source_file=str(source_file),
+                    )
+                )
+                break
+
+    return discovered
+
+
+# Pre-discovered definitions that short-circuit discover_definitions().
+# Embedders and tests set this to supply objects without scanning files.
+discovered_override: contextvars.ContextVar[list[DiscoveredObject] | None] = (
+    contextvars.ContextVar("strata_discovered_override", default=None)
+)
 
 
 # Convenience function for simpler API
@@ -243,7 +302,11 @@ def discover_definitions(
     """Discover all feature definitions in the project.
 
     Convenience wrapper around DefinitionDiscoverer.discover_all().
+    Returns ``discovered_override`` unchanged when it is set.
     """
+    override = discovered_override.get()
+    if override is not None:
+        return override
     discoverer = DefinitionDiscoverer(strata_settings, project_root)
     return discoverer.discover_all()
 
@@ -272,12 +335,19 @@ def serialize_to_spec(obj: Any, kind: str) -> dict[str, Any]:
         raise ValueError(msg)
 
 
+# One canonical encoder for every spec. json.dumps() builds a new encoder
+# per call whenever options are passed; reusing this one skips that setup.
+# Stdlib json is kept on purpose: spec hashes are stored in registries, so
+# the exact output (ASCII escapes, float formatting) must never change.
+_SPEC_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
 def spec_to_json(spec: dict[str, Any]) -> str:
     """Convert spec dict to canonical JSON string.
 
     Sorted keys, no extra whitespace, deterministic output.
     """
-    return json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return _SPEC_ENCODER.encode(spec)
 
 
 def _serialize_entity(entity: core.Entity) -> dict[str, Any]:
@@ -6,6 +6,7 @@ versioning and change tracking using SQLite.
 
 from __future__ import annotations
 
+import itertools
 import sqlite3
 import uuid
 from datetime import datetime, timezone
@@ -205,6 +206,7 @@ class SqliteRegistry(base.BaseRegistry):
         conn = self._connect()
         try:
             cursor = conn.cursor()
+            # The (kind, name) primary key index serves the kind filter
             if kind is not None:
                 cursor.execute(
                     "SELECT kind, name, spec_hash, spec_json, version FROM objects WHERE kind = ?",
@@ -214,17 +216,8 @@ class SqliteRegistry(base.BaseRegistry):
                 cursor.execute(
                     "SELECT kind, name, spec_hash, spec_json, version FROM objects"
                 )
-            rows = cursor.fetchall()
-            return [
-                registry.ObjectRecord(
-                    kind=row[0],
-                    name=row[1],
-                    spec_hash=row[2],
-                    spec_json=row[3],
-                    version=row[4],
-                )
-                for row in rows
-            ]
+            # Columns are selected in ObjectRecord field order
+            return list(itertools.starmap(registry.ObjectRecord, cursor))
         finally:
             conn.close()
 
@@ -5,14 +5,40 @@ Provides Pulumi-style diff output with colors and symbols.
 
 from __future__ import annotations
 
+import os
+from typing import IO
+
 from rich.console import Console
 from rich.table import Table
 
 import strata.diff as diff
 
 
+def make_console(file: IO[str] | None = None) -> Console:
+    """Create a Rich console, honouring ``STRATA_PLAIN``.
+
+    When ``STRATA_PLAIN`` is set to a non-empty value the console emits
+    plain text: no colour, no terminal control codes (so spinners are
+    inert) and a fixed width instead of probing the terminal size. The
+    render_* helpers still produce their full output in plain mode;
+    only its styling is dropped.
+
+    Args:
+        file: Stream to write to. Defaults to stdout.
+    """
+    if os.environ.get("STRATA_PLAIN"):
+        return Console(
+            file=file,
+            no_color=True,
+            force_terminal=False,
+            highlight=False,
+            width=80,
+        )
+    return Console(file=file)
+
+
 # Global console instance
-console = Console()
+console = make_console()
 
 
 def render_diff(result: diff.DiffResult, show_unchanged: bool = False) -> None:
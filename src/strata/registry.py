@@ -11,7 +11,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ObjectRecord:
     """A registered object (entity, feature table, dataset, etc.).
 
@@ -26,7 +26,7 @@ class ObjectRecord:
     version: int  # monotonic, incremented on each update
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChangelogEntry:
     """Record of a registry mutation.
 
@@ -44,7 +44,7 @@ class ChangelogEntry:
     applied_by: str  # user@hostname
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QualityResultRecord:
     """Persisted quality validation result for a table build.
 
@@ -62,7 +62,7 @@ class QualityResultRecord:
     build_id: int | None = None  # Reference to build record
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuildRecord:
     """Record of a table build execution.
 
@@ -84,6 +84,11 @@ class BuildRecord:
 def compute_spec_hash(spec_json: str) -> str:
     """Compute SHA256 hash of canonical JSON spec.
 
+    The algorithm is part of the registry format: stored hashes are
+    compared against fresh ones on every ``up``, so changing it would
+    report every object as updated. SHA256 is also hardware-accelerated
+    in OpenSSL and outpaces blake2b on spec-sized inputs.
+
     Args:
         spec_json: JSON string representation of the object spec.
 
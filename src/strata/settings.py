@@ -6,7 +6,7 @@ Supports environment-specific settings with catalog injection.
 
 from __future__ import annotations
 
-from functools import cache
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import Annotated, ClassVar, Union
 
@@ -222,11 +222,16 @@ def load_strata_settings(
     """
     path = Path(path)
 
-    if not path.exists():
-        raise errors.ConfigNotFoundError(str(path))
+    try:
+        stat = path.stat()
+    except OSError:
+        raise errors.ConfigNotFoundError(str(path)) from None
 
     try:
-        config = oc.OmegaConf.load(path)
+        # Only the YAML parse is cached; interpolations such as
+        # ${oc.env:...} are resolved and validated afresh on every call.
+        raw = _read_config(path.resolve(), stat.st_mtime_ns, stat.st_size)
+        config = oc.OmegaConf.create(raw)
         config_dict = oc.OmegaConf.to_container(config, resolve=True)
         settings = StrataSettings.model_validate(config_dict)
         object.__setattr__(settings, "_config_path", path)
@@ -244,6 +249,17 @@ def load_strata_settings(
         ) from e
 
 
+@lru_cache(maxsize=32)
+def _read_config(path: Path, mtime_ns: int, size: int) -> dict:
+    """Parse a config file into an unresolved container, per file version.
+
+    ``mtime_ns`` and ``size`` are part of the cache key only, so an edited
+    file is parsed again. Callers must not mutate the returned dict.
+    """
+    config = oc.OmegaConf.load(path)
+    return oc.OmegaConf.to_container(config, resolve=False)
+
+
 def _format_validation_errors(error: pdt.ValidationError) -> str:
     """Format Pydantic validation errors into readable messages."""
     messages = []
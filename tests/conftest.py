@@ -5,7 +5,16 @@ Applies workarounds that must be in place before any test module imports.
 
 from __future__ import annotations
 
+import contextlib
 import decimal
+import functools
+import io
+import os
+import shutil
+import sys
+import textwrap
+
+import pytest
 
 # ---------------------------------------------------------------------------
 # Python 3.14 workaround for sqlglot / ibis
@@ -20,3 +29,238 @@ import decimal
 # allows the import to succeed harmlessly.
 # ---------------------------------------------------------------------------
 decimal.getcontext().traps[decimal.InvalidOperation] = False
+
+# ---------------------------------------------------------------------------
+# Plain CLI output
+# ---------------------------------------------------------------------------
+# The CLI consoles are created when strata.cli / strata.output are first
+# imported, so STRATA_PLAIN must be set before any test module imports
+# them. Plain mode skips colour and terminal-size probing for every CLI
+# invocation in the suite.
+# ---------------------------------------------------------------------------
+os.environ.setdefault("STRATA_PLAIN", "1")
+
+
+# ---------------------------------------------------------------------------
+# CLI console helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_cli() -> None:
+    """Resolve every CLI command's arguments once per session.
+
+    cyclopts registers commands at import time but assembles each
+    command's argument collection (type hints, docstrings, lazy imports)
+    on first parse, and builds its help formatter on first ``--help``.
+    Doing both up front keeps that cost out of the first CLI test.
+    Skipped when no collected module imported the CLI.
+    """
+    cli_mod = sys.modules.get("strata.cli")
+    if cli_mod is None:
+        return
+    for name in cli_mod.app:
+        if not name.startswith("-"):
+            cli_mod.app[name].assemble_argument_collection()
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            cli_mod.app(["--help"])
+        except SystemExit:
+            pass
+
+
+@pytest.fixture(scope="session")
+def help_text():
+    """Render ``<command> --help`` once per session and cache the text.
+
+    Call it with the command path, e.g. ``help_text("quality")``.
+    Rendering help runs cyclopts's Rich formatter, so tests checking
+    help output share one rendering per command.
+    """
+    import strata.cli as cli_mod
+
+    @functools.cache
+    def render(*command: str) -> str:
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            try:
+                cli_mod.app([*command, "--help"])
+            except SystemExit as exc:
+                assert exc.code == 0
+        return buffer.getvalue()
+
+    return render
+
+
+_BUFFER_WIDTH = 200
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _console_buffer():
+    """Route the CLI and output consoles into one StringIO per session.
+
+    Both modules share a single plain console writing to the buffer, so
+    CLI output never reaches the terminal and tests read it back through
+    ``console_output`` instead of patching ``console.print``. The buffer
+    console is wide enough that tables render without wrapping, which
+    keeps Rich's layout work small and substring assertions stable;
+    tests asserting visual layout should build their own console. Left
+    alone when no collected module imported the CLI.
+    """
+    buffer = io.StringIO()
+    cli_mod = sys.modules.get("strata.cli")
+    if cli_mod is None:
+        yield buffer
+        return
+
+    import strata.output as output_mod
+
+    console = output_mod.make_console(file=buffer)
+    console.width = _BUFFER_WIDTH
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cli_mod, "console", console)
+        mp.setattr(output_mod, "console", console)
+        yield buffer
+
+
+@pytest.fixture(autouse=True)
+def console_output(_console_buffer):
+    """The session console buffer, emptied before each test."""
+    _console_buffer.seek(0)
+    _console_buffer.truncate()
+    return _console_buffer
+
+
+@pytest.fixture
+def use_project():
+    """Factory pointing CLI commands at a project without ``chdir``.
+
+    Sets ``cli.project_dir`` so commands read ``strata.yaml``, and
+    resolve relative registry and data paths, from the given directory;
+    reset on teardown.
+    """
+    import strata.cli as cli_mod
+
+    tokens = []
+
+    def use(path):
+        tokens.append(cli_mod.project_dir.set(path))
+        return path
+
+    yield use
+    for token in reversed(tokens):
+        cli_mod.project_dir.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Shared CLI project trees
+# ---------------------------------------------------------------------------
+# Session-scoped templates are written once per worker; function-scoped
+# fixtures hand each test its own copy so CLI commands that write
+# .strata/ state never leak between tests.
+# ---------------------------------------------------------------------------
+
+STRATA_YAML = textwrap.dedent(
+    """\
+    name: test-project
+    default_env: dev
+    environments:
+      dev:
+        registry:
+          kind: sqlite
+          path: .strata/registry.db
+        backend:
+          kind: duckdb
+          path: .strata/data
+          catalog: features
+    """
+).encode()
+
+USER_ENTITY = textwrap.dedent(
+    """\
+    import strata.core as core
+    user = core.Entity(name="user", join_keys=["user_id"])
+    """
+).encode()
+
+PRODUCT_ENTITY = textwrap.dedent(
+    """\
+    import strata.core as core
+    product = core.Entity(name="product", join_keys=["product_id"])
+    """
+).encode()
+
+
+@pytest.fixture(scope="session")
+def _project_template(tmp_path_factory):
+    """Minimal project containing only strata.yaml."""
+    root = tmp_path_factory.mktemp("project_template")
+    (root / "strata.yaml").write_bytes(STRATA_YAML)
+    return root
+
+
+@pytest.fixture(scope="session")
+def _objects_template(tmp_path_factory):
+    """Project with strata.yaml and user/product entity definitions."""
+    root = tmp_path_factory.mktemp("objects_template")
+    (root / "strata.yaml").write_bytes(STRATA_YAML)
+    entities_dir = root / "entities"
+    entities_dir.mkdir()
+    (entities_dir / "user.py").write_bytes(USER_ENTITY)
+    (entities_dir / "product.py").write_bytes(PRODUCT_ENTITY)
+    return root
+
+
+@pytest.fixture(scope="session")
+def _registered_template(tmp_path_factory, _objects_template, _console_buffer):
+    """Entity project after a single ``strata up --yes``.
+
+    Running ``up`` once per session and copying the resulting
+    ``.strata/registry.db`` avoids repeating discovery and registry
+    writes in every test that only needs registered objects. Session
+    scoped, so it sets ``cli.project_dir`` itself rather than through
+    ``use_project``; its output goes to the session console buffer,
+    which ``console_output`` empties before each test.
+    """
+    import strata.cli as cli_mod
+
+    root = shutil.copytree(
+        _objects_template, tmp_path_factory.mktemp("registered") / "project"
+    )
+    token = cli_mod.project_dir.set(root)
+    try:
+        cli_mod.app(["up", "--yes"], result_action="return_value")
+    finally:
+        cli_mod.project_dir.reset(token)
+    return root
+
+
+@pytest.fixture
+def project_dir(_project_template, tmp_path):
+    """Per-test copy of the minimal strata.yaml project."""
+    return shutil.copytree(_project_template, tmp_path / "project")
+
+
+@pytest.fixture
+def project_with_objects(_objects_template, tmp_path):
+    """Per-test copy of the project with entity definitions."""
+    return shutil.copytree(_objects_template, tmp_path / "project")
+
+
+@pytest.fixture
+def registered_project(_registered_template, tmp_path):
+    """Per-test copy of the entity project with objects already registered."""
+    return shutil.copytree(_registered_template, tmp_path / "project")
+
+
+# ---------------------------------------------------------------------------
+# Compiler
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def ibis_compiler():
+    """One IbisCompiler per session, without a persistent cache."""
+    import strata.compiler as compiler
+
+    return compiler.IbisCompiler()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import textwrap
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,44 +12,46 @@ import strata.cli as cli_mod
 
 
 def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
+
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
+    """
+    app(args, result_action="return_value", exit_on_error=False)
+
+
+_STRATA_YAML = textwrap.dedent(
+    """\
+    name: test-project
+    default_env: dev
+    schedules:
+      - hourly
+      - daily
+    environments:
+      dev:
+        registry:
+          kind: sqlite
+          path: .strata/registry.db
+        backend:
+          kind: duckdb
+          path: .strata/data
+          catalog: features
+      staging:
+        registry:
+          kind: sqlite
+          path: .strata/staging-registry.db
+        backend:
+          kind: duckdb
+          path: .strata/staging-data
+          catalog: features_staging
+    """
+).encode()
 
 
 @pytest.fixture
 def project_dir(tmp_path):
     """Create a minimal project directory with strata.yaml."""
-    config = tmp_path / "strata.yaml"
-    config.write_text(
-        """
-name: test-project
-default_env: dev
-schedules:
-  - hourly
-  - daily
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-  staging:
-    registry:
-      kind: sqlite
-      path: .strata/staging-registry.db
-    backend:
-      kind: duckdb
-      path: .strata/staging-data
-      catalog: features_staging
-"""
-    )
+    (tmp_path / "strata.yaml").write_bytes(_STRATA_YAML)
     return tmp_path
 
 
@@ -367,7 +370,9 @@ class TestBuildEnvFlag:
                 with patch.object(cli_mod.console, "print"):
                     run_cli(["build", "--env", "staging"])
 
-            mock_load.assert_called_once_with(env="staging")
+            mock_load.assert_called_once_with(
+                cli_mod._config_path(), env="staging"
+            )
 
 
 # ---------------------------------------------------------------------------
@@ -400,25 +405,20 @@ class TestBuildScheduleFilter:
                 assert len(tables_passed) == 1
                 assert tables_passed[0].schedule == "hourly"
 
-    def test_schedule_no_matching_tables(self, project_dir, monkeypatch):
+    def test_schedule_no_matching_tables(
+        self, project_dir, console_output, monkeypatch
+    ):
         """--schedule with no matching tables should exit gracefully."""
         monkeypatch.chdir(project_dir)
 
         discovered = _mock_discovered_tables(schedules=["daily"])
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args))
-
         with patch(
             "strata.discovery.discover_definitions", return_value=discovered
         ):
-            with patch.object(cli_mod.console, "print", capture_print):
-                run_cli(["build", "--schedule", "hourly"])
+            run_cli(["build", "--schedule", "hourly"])
 
-        output_str = " ".join(printed)
-        assert "hourly" in output_str
+        assert "hourly" in console_output.getvalue()
 
     def test_invalid_schedule_errors(self, project_dir, monkeypatch):
         """--schedule with invalid tag should error via settings validation."""
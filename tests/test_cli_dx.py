@@ -6,6 +6,7 @@ Tests --json flag, structured JSON errors, verbose mode, and progress indicators
 from __future__ import annotations
 
 import json
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -17,12 +18,24 @@ from strata.cli import app
 
 
 def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
+
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
+    """
+    app(args, result_action="return_value", exit_on_error=False)
+
+
+class LastCapture:
+    """Console ``print`` stand-in that keeps only the last printed value."""
+
+    __slots__ = ("last",)
+
+    def __init__(self) -> None:
+        self.last = ""
+
+    def __call__(self, *args, **kwargs) -> None:
+        self.last = str(args[0]) if args else ""
 
 
 # ---------------------------------------------------------------------------
@@ -95,10 +108,8 @@ class TestJsonErrorOutput:
 
         printed = []
 
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with patch.object(cli_mod.console, "print", capture_print):
+        # JSON mode prints exactly one string, so list.append is enough.
+        with patch.object(cli_mod.console, "print", printed.append):
             cli_mod._handle_error(err, json_mode=True)
 
         assert len(printed) == 1
@@ -109,7 +120,7 @@ class TestJsonErrorOutput:
         assert data["cause"] == "Invalid format"
         assert data["fix"] == "Check the docs"
 
-    def test_rich_error_output(self):
+    def test_rich_error_output(self, console_output):
         """_handle_error without json_mode should print Rich formatted text."""
         err = errors.StrataError(
             context="Validating config",
@@ -117,15 +128,9 @@ class TestJsonErrorOutput:
             fix="Check the docs",
         )
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with patch.object(cli_mod.console, "print", capture_print):
-            cli_mod._handle_error(err, json_mode=False)
+        cli_mod._handle_error(err, json_mode=False)
 
-        output_str = " ".join(printed)
+        output_str = console_output.getvalue()
         assert "Error:" in output_str
         assert "Cause:" in output_str
         assert "Fix:" in output_str
@@ -168,21 +173,17 @@ user = core.Entity(name="user", join_keys=["user_id"])
         monkeypatch.chdir(tmp_path)
 
         # Register objects
-        with patch.object(cli_mod.console, "print"):
-            with patch.object(output_mod.console, "print"):
-                run_cli(["up", "--yes"])
+        with patch.object(output_mod.console, "print"):
+            run_cli(["up", "--yes"])
 
         # List with --json
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
+        cap = LastCapture()
 
-        with patch.object(cli_mod.console, "print", capture_print):
+        with patch.object(cli_mod.console, "print", cap):
             run_cli(["ls", "--json"])
 
         # Should produce valid JSON array
-        json_str = printed[-1]
+        json_str = cap.last
         data = json.loads(json_str)
         assert isinstance(data, list)
         assert len(data) >= 1
@@ -214,15 +215,12 @@ environments:
         )
         monkeypatch.chdir(tmp_path)
 
-        printed = []
+        cap = LastCapture()
 
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with patch.object(cli_mod.console, "print", capture_print):
+        with patch.object(cli_mod.console, "print", cap):
             run_cli(["ls", "--json"])
 
-        json_str = printed[-1]
+        json_str = cap.last
         data = json.loads(json_str)
         assert data == []
 
@@ -266,16 +264,13 @@ user = core.Entity(name="user", join_keys=["user_id"])
 
         monkeypatch.chdir(tmp_path)
 
-        printed = []
+        cap = LastCapture()
 
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with patch.object(cli_mod.console, "print", capture_print):
+        with patch.object(cli_mod.console, "print", cap):
             run_cli(["validate", "--json"])
 
         # Find the JSON output
-        json_str = printed[-1]
+        json_str = cap.last
         data = json.loads(json_str)
 
         assert "passed" in data
@@ -333,18 +328,15 @@ bad_table = core.FeatureTable(
 
         monkeypatch.chdir(tmp_path)
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
+        cap = LastCapture()
 
-        with patch.object(cli_mod.console, "print", capture_print):
+        with patch.object(cli_mod.console, "print", cap):
             with pytest.raises(SystemExit) as exc_info:
                 app(["validate", "--json"])
 
         assert exc_info.value.code == 1
 
-        json_str = printed[-1]
+        json_str = cap.last
         data = json.loads(json_str)
         assert data["passed"] is False
         assert data["error_count"] > 0
@@ -402,22 +394,19 @@ environments:
         mock_ft.schedule = None
         discovered = [MagicMock(kind="feature_table", obj=mock_ft)]
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
+        cap = LastCapture()
 
         with patch(
             "strata.discovery.discover_definitions", return_value=discovered
         ):
             with patch("strata.build.BuildEngine") as mock_engine_cls:
                 mock_engine_cls.return_value.build.return_value = mock_result
-                with patch.object(cli_mod.console, "print", capture_print):
+                with patch.object(cli_mod.console, "print", cap):
                     with patch.object(cli_mod.console, "status"):
                         run_cli(["build", "--json"])
 
         # Find JSON output
-        json_str = printed[-1]
+        json_str = cap.last
         data = json.loads(json_str)
 
         assert data["success"] is True
@@ -457,13 +446,7 @@ environments:
         )
         monkeypatch.chdir(tmp_path)
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args))
-
-        with patch.object(cli_mod.console, "print", capture_print):
-            run_cli(["validate", "-v"])
+        run_cli(["validate", "-v"])
 
     def test_build_verbose_flag_accepted(self, capsys):
         """build --help should show -v/--verbose flag."""
@@ -502,6 +485,45 @@ environments:
         assert "--verbose" in captured.out or "-v" in captured.out
 
 
+# ---------------------------------------------------------------------------
+# STRATA_PLAIN console mode
+# ---------------------------------------------------------------------------
+
+
+class TestPlainConsole:
+    def test_plain_console_disables_styling(self, monkeypatch):
+        """STRATA_PLAIN should produce an uncoloured, non-terminal console."""
+        monkeypatch.setenv("STRATA_PLAIN", "1")
+
+        console = output_mod.make_console()
+
+        assert console.no_color is True
+        assert console.is_terminal is False
+        assert console.width == 80
+
+    def test_default_console_without_plain(self, monkeypatch):
+        """Without STRATA_PLAIN the console keeps Rich's defaults."""
+        monkeypatch.delenv("STRATA_PLAIN", raising=False)
+
+        console = output_mod.make_console()
+
+        assert console.no_color is False
+
+
+class TestProjectDirOverride:
+    def test_config_path_defaults_to_cwd_relative(self):
+        """Without an override strata.yaml is resolved against the cwd."""
+        assert cli_mod._config_path() == Path("strata.yaml")
+
+    def test_config_path_uses_project_dir(self, project_dir):
+        """Setting project_dir resolves strata.yaml without os.chdir."""
+        token = cli_mod.project_dir.set(project_dir)
+        try:
+            assert cli_mod._config_path() == project_dir / "strata.yaml"
+        finally:
+            cli_mod.project_dir.reset(token)
+
+
 # ---------------------------------------------------------------------------
 # --json flag presence on commands
 # ---------------------------------------------------------------------------
@@ -2,169 +2,139 @@
 
 from __future__ import annotations
 
+import json
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 
 import pytest
 
 import strata.cli as cli_mod
+import strata.discovery as discovery
 import strata.freshness as freshness_mod
 import strata.registry as reg_types
 from strata.cli import app
 
 
 def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
 
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
+    """
+    app(args, result_action="return_value", exit_on_error=False)
 
-@pytest.fixture
-def project_dir(tmp_path):
-    """Create a minimal project directory with strata.yaml."""
-    config = tmp_path / "strata.yaml"
-    config.write_text(
-        """
-name: test-project
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
+
+def _mock_discovered_tables(names: list[str], slas: list | None = None):
+    """Create stand-in discovered objects with feature tables."""
+    return [
+        SimpleNamespace(
+            kind="feature_table",
+            obj=SimpleNamespace(name=name, sla=slas[i] if slas else None),
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+# Shared records. Both types are frozen dataclasses, so tests derive
+# variants with dataclasses.replace() instead of rebuilding them.
+_BUILD = reg_types.BuildRecord(
+    id=1,
+    timestamp=datetime(2025, 1, 1, 11, 0, 0, tzinfo=timezone.utc),
+    table_name="users",
+    status="success",
+    row_count=1000,
+)
+_STALE_BUILD = replace(
+    _BUILD,
+    timestamp=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
+    row_count=None,
+)
+
+_FRESH = freshness_mod.TableFreshness(
+    table_name="users",
+    last_build_at=_BUILD.timestamp,
+    data_timestamp_max=None,
+    build_staleness=timedelta(hours=1),
+    data_staleness=None,
+    max_staleness=None,
+    status="fresh",
+    severity="warn",
+    row_count=1000,
+)
+_STALE = replace(
+    _FRESH,
+    last_build_at=_STALE_BUILD.timestamp,
+    build_staleness=timedelta(hours=8),
+    max_staleness=timedelta(hours=6),
+    status="warn",
+    row_count=None,
+)
+
+
+def _result(
+    table: freshness_mod.TableFreshness,
+) -> freshness_mod.FreshnessResult:
+    """Wrap a single table freshness entry in a result."""
+    return freshness_mod.FreshnessResult(
+        tables=[table],
+        has_stale=table.status != "fresh",
+        has_unknown=False,
     )
-    return tmp_path
 
 
-def _mock_discovered_tables(names: list[str], slas: list | None = None):
-    """Create mock discovered objects with feature tables."""
-    discovered = []
-    for i, name in enumerate(names):
-        mock_ft = MagicMock()
-        mock_ft.name = name
-        mock_ft.sla = slas[i] if slas else None
-        discovered.append(MagicMock(kind="feature_table", obj=mock_ft))
-    return discovered
+@pytest.fixture
+def freshness_env(project_dir, console_output, monkeypatch):
+    """Stub discovery, registry and the freshness check.
+
+    Tests extend ``discovered`` (served through
+    ``discovery.discovered_override``) and assign ``build`` and ``result``;
+    ``output`` is the shared ``console_output`` buffer.
+    """
+    env = SimpleNamespace(
+        discovered=[], build=None, result=None, output=console_output
+    )
 
+    registry = SimpleNamespace(
+        initialize=lambda: None,
+        get_latest_build=lambda name: env.build,
+    )
+    monkeypatch.setattr(cli_mod, "_get_registry", lambda *args: registry)
+    monkeypatch.setattr(
+        "strata.freshness.check_freshness",
+        lambda *args, **kwargs: env.result,
+    )
 
-def _mock_registry_with_builds(builds: dict[str, reg_types.BuildRecord | None]):
-    """Create a mock registry that returns specified build records."""
-    mock_reg = MagicMock()
-    mock_reg.get_latest_build = lambda name: builds.get(name)
-    return mock_reg
+    dir_token = cli_mod.project_dir.set(project_dir)
+    discovered_token = discovery.discovered_override.set(env.discovered)
+    yield env
+    discovery.discovered_override.reset(discovered_token)
+    cli_mod.project_dir.reset(dir_token)
 
 
 class TestFreshnessCommandBasic:
-    def test_freshness_command_runs(self, project_dir, monkeypatch):
+    def test_freshness_command_runs(self, freshness_env):
         """freshness command should run without error when tables exist."""
-        monkeypatch.chdir(project_dir)
-
-        discovered = _mock_discovered_tables(["users"])
-        build = reg_types.BuildRecord(
-            id=1,
-            timestamp=datetime(2025, 1, 1, 11, 0, 0, tzinfo=timezone.utc),
-            table_name="users",
-            status="success",
-            row_count=1000,
-        )
-
-        mock_result = freshness_mod.FreshnessResult(
-            tables=[
-                freshness_mod.TableFreshness(
-                    table_name="users",
-                    last_build_at=build.timestamp,
-                    data_timestamp_max=None,
-                    build_staleness=timedelta(hours=1),
-                    data_staleness=None,
-                    max_staleness=None,
-                    status="fresh",
-                    severity="warn",
-                    row_count=1000,
-                )
-            ],
-            has_stale=False,
-            has_unknown=False,
-        )
-
-        with patch(
-            "strata.discovery.discover_definitions", return_value=discovered
-        ):
-            with patch.object(cli_mod, "_get_registry") as mock_get_reg:
-                mock_reg = MagicMock()
-                mock_reg.get_latest_build.return_value = build
-                mock_get_reg.return_value = mock_reg
+        freshness_env.discovered.extend(_mock_discovered_tables(["users"]))
+        freshness_env.build = _BUILD
+        freshness_env.result = _result(_FRESH)
 
-                with patch(
-                    "strata.freshness.check_freshness", return_value=mock_result
-                ):
-                    with patch.object(cli_mod.console, "print"):
-                        run_cli(["freshness"])
+        run_cli(["freshness"])
 
 
 class TestFreshnessJsonOutput:
-    def test_freshness_json_output_format(self, project_dir, monkeypatch):
+    def test_freshness_json_output_format(self, freshness_env):
         """freshness --json should output valid JSON."""
-        monkeypatch.chdir(project_dir)
-
-        import json as json_lib
-
-        discovered = _mock_discovered_tables(["users"])
-        build = reg_types.BuildRecord(
-            id=1,
-            timestamp=datetime(2025, 1, 1, 11, 0, 0, tzinfo=timezone.utc),
-            table_name="users",
-            status="success",
-            row_count=1000,
-        )
-
-        mock_result = freshness_mod.FreshnessResult(
-            tables=[
-                freshness_mod.TableFreshness(
-                    table_name="users",
-                    last_build_at=build.timestamp,
-                    data_timestamp_max=None,
-                    build_staleness=timedelta(hours=1),
-                    data_staleness=None,
-                    max_staleness=timedelta(hours=6),
-                    status="fresh",
-                    severity="warn",
-                    row_count=1000,
-                )
-            ],
-            has_stale=False,
-            has_unknown=False,
+        freshness_env.discovered.extend(_mock_discovered_tables(["users"]))
+        freshness_env.build = _BUILD
+        freshness_env.result = _result(
+            replace(_FRESH, max_staleness=timedelta(hours=6))
         )
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with patch(
-            "strata.discovery.discover_definitions", return_value=discovered
-        ):
-            with patch.object(cli_mod, "_get_registry") as mock_get_reg:
-                mock_reg = MagicMock()
-                mock_reg.get_latest_build.return_value = build
-                mock_get_reg.return_value = mock_reg
+        cli_mod.freshness(json_output=True)
 
-                with patch(
-                    "strata.freshness.check_freshness", return_value=mock_result
-                ):
-                    with patch.object(cli_mod.console, "print", capture_print):
-                        run_cli(["freshness", "--json"])
-
-        # Should have printed valid JSON
-        json_output = printed[-1]
-        parsed = json_lib.loads(json_output)
+        # --json prints nothing but the JSON document
+        parsed = json.loads(freshness_env.output.getvalue())
         assert "tables" in parsed
         assert "has_stale" in parsed
         assert "has_unknown" in parsed
@@ -174,94 +144,24 @@ class TestFreshnessJsonOutput:
 
 
 class TestFreshnessExitCodeOnError:
-    def test_exit_code_1_on_error_severity_staleness(
-        self, project_dir, monkeypatch
-    ):
+    def test_exit_code_1_on_error_severity_staleness(self, freshness_env):
         """freshness should exit 1 when any table has status='error'."""
-        monkeypatch.chdir(project_dir)
-
-        discovered = _mock_discovered_tables(["users"])
-        build = reg_types.BuildRecord(
-            id=1,
-            timestamp=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
-            table_name="users",
-            status="success",
-        )
-
-        mock_result = freshness_mod.FreshnessResult(
-            tables=[
-                freshness_mod.TableFreshness(
-                    table_name="users",
-                    last_build_at=build.timestamp,
-                    data_timestamp_max=None,
-                    build_staleness=timedelta(hours=8),
-                    data_staleness=None,
-                    max_staleness=timedelta(hours=6),
-                    status="error",
-                    severity="error",
-                )
-            ],
-            has_stale=True,
-            has_unknown=False,
+        freshness_env.discovered.extend(_mock_discovered_tables(["users"]))
+        freshness_env.build = _STALE_BUILD
+        freshness_env.result = _result(
+            replace(_STALE, status="error", severity="error")
         )
 
-        with patch(
-            "strata.discovery.discover_definitions", return_value=discovered
-        ):
-            with patch.object(cli_mod, "_get_registry") as mock_get_reg:
-                mock_reg = MagicMock()
-                mock_reg.get_latest_build.return_value = build
-                mock_get_reg.return_value = mock_reg
-
-                with patch(
-                    "strata.freshness.check_freshness", return_value=mock_result
-                ):
-                    with patch.object(cli_mod.console, "print"):
-                        with pytest.raises(SystemExit) as exc_info:
-                            app(["freshness"])
+        with pytest.raises(SystemExit) as exc_info:
+            cli_mod.freshness()
 
         assert exc_info.value.code == 1
 
-    def test_exit_code_0_on_warn_severity(self, project_dir, monkeypatch):
+    def test_exit_code_0_on_warn_severity(self, freshness_env):
         """freshness should exit 0 when tables have warn but not error status."""
-        monkeypatch.chdir(project_dir)
-
-        discovered = _mock_discovered_tables(["users"])
-        build = reg_types.BuildRecord(
-            id=1,
-            timestamp=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
-            table_name="users",
-            status="success",
-        )
-
-        mock_result = freshness_mod.FreshnessResult(
-            tables=[
-                freshness_mod.TableFreshness(
-                    table_name="users",
-                    last_build_at=build.timestamp,
-                    data_timestamp_max=None,
-                    build_staleness=timedelta(hours=8),
-                    data_staleness=None,
-                    max_staleness=timedelta(hours=6),
-                    status="warn",
-                    severity="warn",
-                )
-            ],
-            has_stale=True,
-            has_unknown=False,
-        )
+        freshness_env.discovered.extend(_mock_discovered_tables(["users"]))
+        freshness_env.build = _STALE_BUILD
+        freshness_env.result = _result(_STALE)
 
-        with patch(
-            "strata.discovery.discover_definitions", return_value=discovered
-        ):
-            with patch.object(cli_mod, "_get_registry") as mock_get_reg:
-                mock_reg = MagicMock()
-                mock_reg.get_latest_build.return_value = build
-                mock_get_reg.return_value = mock_reg
-
-                with patch(
-                    "strata.freshness.check_freshness", return_value=mock_result
-                ):
-                    with patch.object(cli_mod.console, "print"):
-                        run_cli(["freshness"])
-                        # Should NOT raise SystemExit -- warn is not error
+        # Should NOT raise SystemExit -- warn is not error
+        cli_mod.freshness()
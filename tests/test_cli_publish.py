@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pyarrow as pa
@@ -10,17 +11,31 @@ import pytest
 
 import strata.cli as cli_mod
 import strata.core as core
+import strata.discovery as discovery
+import strata.infra.backends.base as infra_base
+import strata.infra.serving.base as serving_base
 import strata.sources as sources
 from strata.cli import app
 
 
 def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
+
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
+    """
+    app(args, result_action="return_value", exit_on_error=False)
+
+
+# Offline rows for user_features; Arrow tables are immutable, so every
+# test can hand out the same instance.
+_SAMPLE_TABLE = pa.table(
+    {
+        "user_id": ["u1", "u2", "u3"],
+        "spend": [100.0, 200.0, 300.0],
+        "event_ts": ["2024-01-01", "2024-01-02", "2024-01-03"],
+    }
+)
 
 
 def _make_entity() -> core.Entity:
@@ -48,206 +63,133 @@ def _make_feature_table(
     )
 
 
-def _make_discovered(feature_tables: list) -> list:
-    """Build mock discovered objects list from feature tables."""
-    discovered = []
-    for ft in feature_tables:
-        mock_disc = MagicMock()
-        mock_disc.kind = "feature_table"
-        mock_disc.name = ft.name
-        mock_disc.obj = ft
-        discovered.append(mock_disc)
-    return discovered
+@pytest.fixture
+def publish_env(console_output, monkeypatch):
+    """Stub settings and discovery for publish tests.
+
+    Tests extend ``discovered`` (served through
+    ``discovery.discovered_override``) and tweak ``settings`` / ``backend``
+    / ``online`` as needed; ``output`` is the shared ``console_output``
+    buffer.
+    """
+    # Spec'd against the base classes: no attribute autogeneration, and
+    # typos in stubbed or asserted methods fail loudly.
+    backend = MagicMock(spec=infra_base.BaseBackend)
+    online = MagicMock(spec=serving_base.BaseOnlineStore)
+    mock_settings = SimpleNamespace(
+        active_env="dev",
+        active_environment=SimpleNamespace(
+            backend=backend,
+            online_store=online,
+            registry=MagicMock(spec=infra_base.BaseRegistry),
+        ),
+    )
 
+    env = SimpleNamespace(
+        settings=mock_settings,
+        backend=backend,
+        online=online,
+        discovered=[],
+        output=console_output,
+    )
 
-# ---------------------------------------------------------------------------
-# Tests: publish -- no online store
-# ---------------------------------------------------------------------------
+    monkeypatch.setattr(
+        "strata.settings.load_strata_settings",
+        lambda *args, **kwargs: mock_settings,
+    )
 
+    token = discovery.discovered_override.set(env.discovered)
+    yield env
+    discovery.discovered_override.reset(token)
 
-class TestPublishNoOnlineStore:
-    def test_publish_no_online_store(self, monkeypatch, tmp_path):
-        """Publish command errors when no online store is configured."""
-        monkeypatch.chdir(tmp_path)
 
-        ft = _make_feature_table(online=True)
-        discovered = _make_discovered([ft])
+def _make_discovered(feature_tables: list) -> list:
+    """Build stand-in discovered objects list from feature tables."""
+    return [
+        SimpleNamespace(kind="feature_table", name=ft.name, obj=ft)
+        for ft in feature_tables
+    ]
 
-        mock_settings = MagicMock()
-        mock_settings.active_environment.online_store = None
-        mock_settings.active_environment.backend = MagicMock()
 
-        printed = []
+# ---------------------------------------------------------------------------
+# Tests: publish -- nothing to publish
+# ---------------------------------------------------------------------------
 
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
 
-        with (
-            patch(
-                "strata.settings.load_strata_settings",
-                return_value=mock_settings,
-            ),
-            patch(
-                "strata.discovery.discover_definitions", return_value=discovered
-            ),
-            patch.object(cli_mod.console, "print", capture_print),
-        ):
+class TestPublishNothingToPublish:
+    @pytest.mark.parametrize(
+        ("has_online_store", "online", "table", "exit_code", "message"),
+        [
+            (False, True, None, 1, "No online store configured"),
+            (True, False, None, None, "No online tables found"),
+            (True, True, "nonexistent_table", 1, "not found"),
+        ],
+        ids=["no-online-store", "no-online-tables", "table-not-found"],
+    )
+    def test_publish_reports_why(
+        self, publish_env, has_online_store, online, table, exit_code, message
+    ):
+        """Publish explains why nothing was published, exiting 1 on errors."""
+        ft = _make_feature_table(online=online)
+        publish_env.discovered.extend(_make_discovered([ft]))
+        if not has_online_store:
+            publish_env.settings.active_environment.online_store = None
+
+        if exit_code is None:
+            cli_mod.publish(table)
+        else:
             with pytest.raises(SystemExit) as exc_info:
-                app(["publish"])
+                cli_mod.publish(table)
+            assert exc_info.value.code == exit_code
 
-        assert exc_info.value.code == 1
-        output_str = " ".join(printed)
-        assert "No online store configured" in output_str
+        assert message in publish_env.output.getvalue()
 
 
 # ---------------------------------------------------------------------------
-# Tests: publish -- no online tables
+# Tests: publish -- specific table / JSON output
 # ---------------------------------------------------------------------------
 
 
-class TestPublishNoOnlineTables:
-    def test_publish_no_online_tables(self, monkeypatch, tmp_path):
-        """Publish shows message when no tables have online=True."""
-        monkeypatch.chdir(tmp_path)
-
-        ft = _make_feature_table(online=False)
-        discovered = _make_discovered([ft])
+def _check_text_output(env) -> None:
+    """Publishing by name writes the table and reports it."""
+    env.online.write_batch.assert_called_once()
+    call_kwargs = env.online.write_batch.call_args
+    assert call_kwargs[1]["table_name"] == "user_features"
 
-        mock_online = MagicMock()
-        mock_settings = MagicMock()
-        mock_settings.active_environment.online_store = mock_online
-        mock_settings.active_environment.backend = MagicMock()
+    assert "Published 1 table" in env.output.getvalue()
 
-        printed = []
 
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with (
-            patch(
-                "strata.settings.load_strata_settings",
-                return_value=mock_settings,
-            ),
-            patch(
-                "strata.discovery.discover_definitions", return_value=discovered
-            ),
-            patch.object(cli_mod.console, "print", capture_print),
-        ):
-            run_cli(["publish"])
-
-        output_str = " ".join(printed)
-        assert "No online tables found" in output_str
-
-
-# ---------------------------------------------------------------------------
-# Tests: publish -- specific table
-# ---------------------------------------------------------------------------
+def _check_json_output(env) -> None:
+    """--json produces structured output and nothing else."""
+    data = json.loads(env.output.getvalue())
 
+    assert data["published"] == 1
+    assert isinstance(data["tables"], list)
+    assert len(data["tables"]) == 1
+    assert data["tables"][0]["table"] == "user_features"
+    assert data["tables"][0]["status"] == "published"
+    assert data["tables"][0]["entities"] == 3
 
-class TestPublishSpecificTable:
-    def test_publish_specific_table(self, monkeypatch, tmp_path):
-        """Publish a specific table by name."""
-        monkeypatch.chdir(tmp_path)
 
+class TestPublishOnlineTable:
+    @pytest.mark.parametrize(
+        ("args", "check"),
+        [
+            (["publish", "user_features"], _check_text_output),
+            (["publish", "--json"], _check_json_output),
+        ],
+        ids=["specific-table", "json"],
+    )
+    def test_publish_online_table(self, publish_env, args, check):
+        """Publish an online table by name or with JSON output."""
         ft = _make_feature_table("user_features", online=True)
-        discovered = _make_discovered([ft])
-
-        mock_backend = MagicMock()
-        mock_backend.table_exists.return_value = True
-        mock_backend.read_table.return_value = pa.table(
-            {
-                "user_id": ["u1", "u2"],
-                "spend": [100.0, 200.0],
-                "event_ts": ["2024-01-01", "2024-01-02"],
-            }
-        )
-
-        mock_online = MagicMock()
-        mock_settings = MagicMock()
-        mock_settings.active_environment.online_store = mock_online
-        mock_settings.active_environment.backend = mock_backend
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with (
-            patch(
-                "strata.settings.load_strata_settings",
-                return_value=mock_settings,
-            ),
-            patch(
-                "strata.discovery.discover_definitions", return_value=discovered
-            ),
-            patch.object(cli_mod.console, "print", capture_print),
-        ):
-            run_cli(["publish", "user_features"])
-
-        # Verify write_batch was called
-        mock_online.write_batch.assert_called_once()
-        call_kwargs = mock_online.write_batch.call_args
-        assert call_kwargs[1]["table_name"] == "user_features"
-
-        output_str = " ".join(printed)
-        assert "Published 1 table" in output_str
-
-
-# ---------------------------------------------------------------------------
-# Tests: publish -- JSON output
-# ---------------------------------------------------------------------------
+        publish_env.discovered.extend(_make_discovered([ft]))
+        publish_env.backend.table_exists.return_value = True
+        publish_env.backend.read_table.return_value = _SAMPLE_TABLE
 
+        run_cli(args)
 
-class TestPublishJsonOutput:
-    def test_publish_json_output(self, monkeypatch, tmp_path):
-        """--json flag produces structured JSON output."""
-        monkeypatch.chdir(tmp_path)
-
-        ft = _make_feature_table("user_features", online=True)
-        discovered = _make_discovered([ft])
-
-        mock_backend = MagicMock()
-        mock_backend.table_exists.return_value = True
-        mock_backend.read_table.return_value = pa.table(
-            {
-                "user_id": ["u1", "u2", "u3"],
-                "spend": [100.0, 200.0, 300.0],
-                "event_ts": ["2024-01-01", "2024-01-02", "2024-01-03"],
-            }
-        )
-
-        mock_online = MagicMock()
-        mock_settings = MagicMock()
-        mock_settings.active_environment.online_store = mock_online
-        mock_settings.active_environment.backend = mock_backend
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with (
-            patch(
-                "strata.settings.load_strata_settings",
-                return_value=mock_settings,
-            ),
-            patch(
-                "strata.discovery.discover_definitions", return_value=discovered
-            ),
-            patch.object(cli_mod.console, "print", capture_print),
-        ):
-            run_cli(["publish", "--json"])
-
-        # Find the JSON output
-        json_str = printed[-1]
-        data = json.loads(json_str)
-
-        assert data["published"] == 1
-        assert isinstance(data["tables"], list)
-        assert len(data["tables"]) == 1
-        assert data["tables"][0]["table"] == "user_features"
-        assert data["tables"][0]["status"] == "published"
-        assert data["tables"][0]["entities"] == 3
+        check(publish_env)
 
 
 # ---------------------------------------------------------------------------
@@ -256,22 +198,12 @@ class TestPublishJsonOutput:
 
 
 class TestBuildWithPublishFlag:
-    def test_build_with_publish_flag(self, monkeypatch, tmp_path):
+    def test_build_with_publish_flag(self, publish_env):
         """Build with --publish runs build then publish."""
-        monkeypatch.chdir(tmp_path)
-
         ft = _make_feature_table("user_features", online=True)
-        discovered = _make_discovered([ft])
-
-        mock_backend = MagicMock()
-        mock_backend.table_exists.return_value = True
-        mock_backend.read_table.return_value = pa.table(
-            {
-                "user_id": ["u1"],
-                "spend": [100.0],
-                "event_ts": ["2024-01-01"],
-            }
-        )
+        publish_env.discovered.extend(_make_discovered([ft]))
+        publish_env.backend.table_exists.return_value = True
+        publish_env.backend.read_table.return_value = _SAMPLE_TABLE
 
         # Mock build engine result
         mock_build_result = MagicMock()
@@ -286,37 +218,15 @@ class TestBuildWithPublishFlag:
         mock_engine = MagicMock()
         mock_engine.build.return_value = mock_build_result
 
-        mock_online = MagicMock()
-        mock_settings = MagicMock()
-        mock_settings.active_environment.online_store = mock_online
-        mock_settings.active_environment.backend = mock_backend
-        mock_settings.active_environment.registry = MagicMock()
-        mock_settings.active_env = "dev"
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with (
-            patch(
-                "strata.settings.load_strata_settings",
-                return_value=mock_settings,
-            ),
-            patch(
-                "strata.discovery.discover_definitions", return_value=discovered
-            ),
-            patch("strata.build.BuildEngine", return_value=mock_engine),
-            patch.object(cli_mod.console, "print", capture_print),
-        ):
+        with patch("strata.build.BuildEngine", return_value=mock_engine):
             run_cli(["build", "--publish"])
 
         # Build was called
         mock_engine.build.assert_called_once()
         # Publish was also called
-        mock_online.write_batch.assert_called_once()
+        publish_env.online.write_batch.assert_called_once()
 
-        output_str = " ".join(printed)
+        output_str = publish_env.output.getvalue()
         assert "Published 1 table" in output_str
 
 
@@ -336,44 +246,3 @@ class TestPublishHelp:
         captured = capsys.readouterr()
         assert "--json" in captured.out
         assert "--env" in captured.out
-
-
-# ---------------------------------------------------------------------------
-# Tests: publish -- table not found
-# ---------------------------------------------------------------------------
-
-
-class TestPublishTableNotFound:
-    def test_publish_specific_table_not_found(self, monkeypatch, tmp_path):
-        """Publishing a nonexistent table raises an error."""
-        monkeypatch.chdir(tmp_path)
-
-        ft = _make_feature_table("user_features", online=True)
-        discovered = _make_discovered([ft])
-
-        mock_online = MagicMock()
-        mock_settings = MagicMock()
-        mock_settings.active_environment.online_store = mock_online
-        mock_settings.active_environment.backend = MagicMock()
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with (
-            patch(
-                "strata.settings.load_strata_settings",
-                return_value=mock_settings,
-            ),
-            patch(
-                "strata.discovery.discover_definitions", return_value=discovered
-            ),
-            patch.object(cli_mod.console, "print", capture_print),
-        ):
-            with pytest.raises(SystemExit) as exc_info:
-                app(["publish", "nonexistent_table"])
-
-        assert exc_info.value.code == 1
-        output_str = " ".join(printed)
-        assert "not found" in output_str
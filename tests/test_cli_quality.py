@@ -3,46 +3,86 @@
 from __future__ import annotations
 
 import json
+from dataclasses import replace
 from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 
 import pytest
 
-import strata.cli as cli_mod
+import strata.discovery as discovery
 from strata.cli import app
 import strata.quality as quality_mod
 import strata.registry as reg_types
 
 
+# Keep the module on one xdist worker so its module-scoped fixtures are
+# built once (effective with ``--dist=loadgroup``).
+pytestmark = pytest.mark.xdist_group(name=__name__)
+
+
 def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
+
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
+    """
+    app(args, result_action="return_value", exit_on_error=False)
+
+
+@pytest.fixture
+def project_dir(_project_template):
+    """Shared read-only project.
+
+    Quality tests stub settings and the registry, so nothing is written
+    and the session template can be used without a per-test copy.
+    """
+    return _project_template
 
 
 @pytest.fixture
-def project_dir(tmp_path):
-    """Create a minimal project directory with strata.yaml."""
-    config = tmp_path / "strata.yaml"
-    config.write_text(
-        """
-name: test-project
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
+def quality_env(project_dir, use_project, monkeypatch):
+    """Run in the shared project with settings stubbed to a fake registry.
+
+    Tests assign ``results`` (what ``get_quality_results`` returns);
+    rendered output is read from ``console_output``.
+    """
+    use_project(project_dir)
+
+    env = SimpleNamespace(results=[])
+    registry = SimpleNamespace(
+        initialize=lambda: None,
+        get_quality_results=lambda *args, **kwargs: env.results,
     )
-    return tmp_path
+    stub_settings = SimpleNamespace(
+        active_environment=SimpleNamespace(registry=registry)
+    )
+    monkeypatch.setattr(
+        "strata.cli._load_settings", lambda *args, **kwargs: stub_settings
+    )
+    return env
+
+
+_DEFAULT_ROWS = 1000
+
+# The default single passing constraint, shared by every result built
+# without custom constraints (all three dataclasses are frozen).
+_DEFAULT_CONSTRAINT = quality_mod.ConstraintResult(
+    field_name="amount",
+    constraint="ge",
+    passed=True,
+    severity="error",
+    expected=">= 0",
+    actual="min=5.0",
+    rows_checked=_DEFAULT_ROWS,
+    rows_failed=0,
+)
+_DEFAULT_FIELD_RESULTS = [
+    quality_mod.FieldResult(
+        field_name="amount",
+        constraints=[_DEFAULT_CONSTRAINT],
+        passed=True,
+    )
+]
 
 
 def _make_validation_result(
@@ -50,23 +90,20 @@ def _make_validation_result(
     table_name: str = "user_features",
     passed: bool = True,
     has_warnings: bool = False,
-    rows_checked: int = 1000,
+    rows_checked: int = _DEFAULT_ROWS,
     constraints: list[quality_mod.ConstraintResult] | None = None,
 ) -> quality_mod.TableValidationResult:
     """Build a TableValidationResult for tests."""
+    if constraints is None and rows_checked == _DEFAULT_ROWS:
+        return quality_mod.TableValidationResult(
+            table_name=table_name,
+            field_results=_DEFAULT_FIELD_RESULTS,
+            rows_checked=rows_checked,
+            passed=passed,
+            has_warnings=has_warnings,
+        )
     if constraints is None:
-        constraints = [
-            quality_mod.ConstraintResult(
-                field_name="amount",
-                constraint="ge",
-                passed=True,
-                severity="error",
-                expected=">= 0",
-                actual="min=5.0",
-                rows_checked=rows_checked,
-                rows_failed=0,
-            ),
-        ]
+        constraints = [replace(_DEFAULT_CONSTRAINT, rows_checked=rows_checked)]
 
     field_results = []
     fields_seen: dict[str, list[quality_mod.ConstraintResult]] = {}
@@ -95,8 +132,37 @@ def _make_validation_result(
 def _make_quality_record(
     result: quality_mod.TableValidationResult,
 ) -> reg_types.QualityResultRecord:
-    """Build a QualityResultRecord from a TableValidationResult."""
-    from dataclasses import asdict
+    """Build a QualityResultRecord from a TableValidationResult.
+
+    Serializes the same shape as ``dataclasses.asdict`` but builds the
+    dicts directly instead of deep-copying every nested field.
+    """
+    results = {
+        "table_name": result.table_name,
+        "field_results": [
+            {
+                "field_name": fr.field_name,
+                "constraints": [
+                    {
+                        "field_name": c.field_name,
+                        "constraint": c.constraint,
+                        "passed": c.passed,
+                        "severity": c.severity,
+                        "expected": c.expected,
+                        "actual": c.actual,
+                        "rows_checked": c.rows_checked,
+                        "rows_failed": c.rows_failed,
+                    }
+                    for c in fr.constraints
+                ],
+                "passed": fr.passed,
+            }
+            for fr in result.field_results
+        ],
+        "rows_checked": result.rows_checked,
+        "passed": result.passed,
+        "has_warnings": result.has_warnings,
+    }
 
     return reg_types.QualityResultRecord(
         id=1,
@@ -105,38 +171,50 @@ def _make_quality_record(
         passed=result.passed,
         has_warnings=result.has_warnings,
         rows_checked=result.rows_checked,
-        results_json=json.dumps(asdict(result), default=str),
+        results_json=json.dumps(results, separators=(",", ":")),
+    )
+
+
+def _failed_ge(severity: str) -> quality_mod.ConstraintResult:
+    """A failed ``amount >= 0`` check at the given severity."""
+    return quality_mod.ConstraintResult(
+        field_name="amount",
+        constraint="ge",
+        passed=False,
+        severity=severity,
+        expected=">= 0",
+        actual="min=-5.0",
+        rows_checked=1000,
+        rows_failed=10,
     )
 
 
+# Canonical records, built once. The CLI only reads them, so tests share
+# the instances.
+_PASS_RECORD = _make_quality_record(_make_validation_result())
+_FAIL_RECORD = _make_quality_record(
+    _make_validation_result(passed=False, constraints=[_failed_ge("error")])
+)
+_WARN_RECORD = _make_quality_record(
+    _make_validation_result(
+        passed=True, has_warnings=True, constraints=[_failed_ge("warn")]
+    )
+)
+
+
 # ---------------------------------------------------------------------------
 # No results
 # ---------------------------------------------------------------------------
 
 
 class TestQualityNoResults:
-    def test_quality_no_results_shows_hint(self, project_dir, monkeypatch):
+    def test_quality_no_results_shows_hint(self, quality_env, console_output):
         """When no quality results exist, show hint message."""
-        monkeypatch.chdir(project_dir)
-
-        mock_reg = MagicMock()
-        mock_reg.get_quality_results.return_value = []
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args))
+        quality_env.results = []
 
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch.object(cli_mod.console, "print", capture_print):
-                run_cli(["quality", "user_features"])
+        run_cli(["quality", "user_features"])
 
-        output_str = " ".join(printed)
+        output_str = console_output.getvalue()
         assert "No quality results found" in output_str
         assert (
             "strata build" in output_str
@@ -150,31 +228,15 @@ class TestQualityNoResults:
 
 
 class TestQualityWithResults:
-    def test_quality_with_results_renders_table(self, project_dir, monkeypatch):
+    def test_quality_with_results_renders_table(
+        self, quality_env, console_output
+    ):
         """When quality results exist, render Rich table."""
-        monkeypatch.chdir(project_dir)
-
-        result = _make_validation_result()
-        record = _make_quality_record(result)
-
-        mock_reg = MagicMock()
-        mock_reg.get_quality_results.return_value = [record]
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args))
+        quality_env.results = [_PASS_RECORD]
 
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch.object(cli_mod.console, "print", capture_print):
-                run_cli(["quality", "user_features"])
+        run_cli(["quality", "user_features"])
 
-        output_str = " ".join(printed)
+        output_str = console_output.getvalue()
         assert "Quality: user_features" in output_str
         assert "PASSED" in output_str
         assert "1000" in output_str
@@ -186,42 +248,30 @@ class TestQualityWithResults:
 
 
 class TestQualityJsonOutput:
-    def test_quality_json_output_format(self, project_dir, monkeypatch):
-        """--json should output valid JSON with expected fields."""
-        monkeypatch.chdir(project_dir)
+    def test_quality_json_is_parseable(self, quality_env, console_output):
+        """--json should print nothing but one valid JSON document."""
+        quality_env.results = [_PASS_RECORD]
 
-        result = _make_validation_result()
-        record = _make_quality_record(result)
+        run_cli(["quality", "user_features", "--json"])
 
-        mock_reg = MagicMock()
-        mock_reg.get_quality_results.return_value = [record]
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
-
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
+        data = json.loads(console_output.getvalue())
+        assert isinstance(data["fields"], list)
+        assert len(data["fields"]) == 1
 
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch.object(cli_mod.console, "print", capture_print):
-                run_cli(["quality", "user_features", "--json"])
+    def test_quality_json_output_format(self, quality_env, console_output):
+        """--json should output the expected fields."""
+        quality_env.results = [_PASS_RECORD]
 
-        # Find the JSON output (the last print call should be the JSON)
-        json_str = printed[-1]
-        data = json.loads(json_str)
+        run_cli(["quality", "user_features", "--json"])
 
-        assert data["table"] == "user_features"
-        assert data["passed"] is True
-        assert data["has_warnings"] is False
-        assert data["rows_checked"] == 1000
-        assert isinstance(data["fields"], list)
-        assert len(data["fields"]) == 1
-        assert data["fields"][0]["field"] == "amount"
-        assert data["fields"][0]["constraints"][0]["constraint"] == "ge"
+        # Shape is fixed, so check the serialized fields as substrings
+        json_str = console_output.getvalue()
+        assert '"table": "user_features"' in json_str
+        assert '"passed": true' in json_str
+        assert '"has_warnings": false' in json_str
+        assert '"rows_checked": 1000' in json_str
+        assert '"field": "amount"' in json_str
+        assert '"constraint": "ge"' in json_str
 
 
 # ---------------------------------------------------------------------------
@@ -230,39 +280,12 @@ class TestQualityJsonOutput:
 
 
 class TestQualityExitCodeOnFailure:
-    def test_quality_exit_code_on_error_failure(self, project_dir, monkeypatch):
+    def test_quality_exit_code_on_error_failure(self, quality_env):
         """Exit code should be 1 when error-severity constraint fails."""
-        monkeypatch.chdir(project_dir)
-
-        result = _make_validation_result(
-            passed=False,
-            constraints=[
-                quality_mod.ConstraintResult(
-                    field_name="amount",
-                    constraint="ge",
-                    passed=False,
-                    severity="error",
-                    expected=">= 0",
-                    actual="min=-5.0",
-                    rows_checked=1000,
-                    rows_failed=10,
-                ),
-            ],
-        )
-        record = _make_quality_record(result)
-
-        mock_reg = MagicMock()
-        mock_reg.get_quality_results.return_value = [record]
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
+        quality_env.results = [_FAIL_RECORD]
 
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch.object(cli_mod.console, "print"):
-                with pytest.raises(SystemExit) as exc_info:
-                    app(["quality", "user_features"])
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli(["quality", "user_features"])
 
         assert exc_info.value.code == 1
 
@@ -273,42 +296,12 @@ class TestQualityExitCodeOnFailure:
 
 
 class TestQualityWarningsStillPass:
-    def test_warn_severity_does_not_exit_nonzero(
-        self, project_dir, monkeypatch
-    ):
+    def test_warn_severity_does_not_exit_nonzero(self, quality_env):
         """Warn-severity failures should NOT cause exit code 1."""
-        monkeypatch.chdir(project_dir)
-
-        result = _make_validation_result(
-            passed=True,
-            has_warnings=True,
-            constraints=[
-                quality_mod.ConstraintResult(
-                    field_name="amount",
-                    constraint="ge",
-                    passed=False,
-                    severity="warn",
-                    expected=">= 0",
-                    actual="min=-5.0",
-                    rows_checked=1000,
-                    rows_failed=10,
-                ),
-            ],
-        )
-        record = _make_quality_record(result)
+        quality_env.results = [_WARN_RECORD]
 
-        mock_reg = MagicMock()
-        mock_reg.get_quality_results.return_value = [record]
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
-
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch.object(cli_mod.console, "print"):
-                # Should NOT raise SystemExit
-                run_cli(["quality", "user_features"])
+        # Should NOT raise SystemExit
+        run_cli(["quality", "user_features"])
 
 
 # ---------------------------------------------------------------------------
@@ -317,25 +310,15 @@ class TestQualityWarningsStillPass:
 
 
 class TestQualityTableNotFound:
-    def test_quality_live_table_not_found(self, project_dir, monkeypatch):
+    def test_quality_live_table_not_found(self, quality_env):
         """--live with non-existent table should exit 1 with error message."""
-        monkeypatch.chdir(project_dir)
-
-        mock_reg = MagicMock()
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
-
         # No feature tables discovered
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch(
-                "strata.discovery.discover_definitions", return_value=[]
-            ):
-                with patch.object(cli_mod.console, "print"):
-                    with pytest.raises(SystemExit) as exc_info:
-                        app(["quality", "nonexistent", "--live"])
+        token = discovery.discovered_override.set([])
+        try:
+            with pytest.raises(SystemExit) as exc_info:
+                run_cli(["quality", "nonexistent", "--live"])
+        finally:
+            discovery.discovered_override.reset(token)
 
         assert exc_info.value.code == 1
 
@@ -346,18 +329,14 @@ class TestQualityTableNotFound:
 
 
 class TestQualityHelp:
-    def test_quality_help_shows_options(self, capsys):
+    def test_quality_help_shows_options(self, help_text):
         """quality --help should show all flags."""
-        with pytest.raises(SystemExit) as exc_info:
-            app(["quality", "--help"])
-
-        assert exc_info.value.code == 0
+        text = help_text("quality")
 
-        captured = capsys.readouterr()
-        assert "--json" in captured.out
-        assert "--live" in captured.out
-        assert "--env" in captured.out
-        assert "TABLE" in captured.out or "--table" in captured.out
+        assert "--json" in text
+        assert "--live" in text
+        assert "--env" in text
+        assert "TABLE" in text or "--table" in text
 
 
 # ---------------------------------------------------------------------------
@@ -366,48 +345,14 @@ class TestQualityHelp:
 
 
 class TestQualityJsonExitCode:
-    def test_json_output_exits_on_failure(self, project_dir, monkeypatch):
+    def test_json_output_exits_on_failure(self, quality_env, console_output):
         """--json with failing constraints should still exit 1."""
-        monkeypatch.chdir(project_dir)
-
-        result = _make_validation_result(
-            passed=False,
-            constraints=[
-                quality_mod.ConstraintResult(
-                    field_name="score",
-                    constraint="le",
-                    passed=False,
-                    severity="error",
-                    expected="<= 100",
-                    actual="max=150",
-                    rows_checked=500,
-                    rows_failed=3,
-                ),
-            ],
-        )
-        record = _make_quality_record(result)
-
-        mock_reg = MagicMock()
-        mock_reg.get_quality_results.return_value = [record]
-
-        mock_settings = MagicMock()
-        mock_settings.active_environment.registry = mock_reg
+        quality_env.results = [_FAIL_RECORD]
 
-        printed = []
-
-        def capture_print(*args, **kwargs):
-            printed.append(str(args[0]) if args else "")
-
-        with patch(
-            "strata.settings.load_strata_settings", return_value=mock_settings
-        ):
-            with patch.object(cli_mod.console, "print", capture_print):
-                with pytest.raises(SystemExit) as exc_info:
-                    app(["quality", "user_features", "--json"])
+        with pytest.raises(SystemExit) as exc_info:
+            run_cli(["quality", "user_features", "--json"])
 
         assert exc_info.value.code == 1
 
-        # Should still produce valid JSON before exiting
-        json_str = printed[-1]
-        data = json.loads(json_str)
-        assert data["passed"] is False
+        # Should still produce the JSON document before exiting
+        assert '"passed": false' in console_output.getvalue()
@@ -5,104 +5,75 @@ from unittest.mock import patch
 import pytest
 
 from strata.cli import app
+import strata.discovery as discovery
 import strata.output as output_mod
+import strata.settings as settings
 
 
 def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
+
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
+    """
+    app(args, result_action="return_value", exit_on_error=False)
 
 
 @pytest.fixture
-def project_dir(tmp_path):
-    """Create a minimal project directory with strata.yaml."""
-    config = tmp_path / "strata.yaml"
-    config.write_text(
-        """
-name: test-project
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-    )
-
-    # Create entities directory with a definition
-    entities_dir = tmp_path / "entities"
-    entities_dir.mkdir()
-    (entities_dir / "user.py").write_text(
-        """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-    )
-
-    return tmp_path
+def registry_objects(project_with_objects):
+    """Read registered objects once the CLI has written the registry.
+
+    Returns a callable so tests read after running ``up``. The schema was
+    already created by the command, so ``initialize()`` is skipped; a
+    missing registry reads as empty.
+    """
+    from strata.infra.backends.sqlite.registry import SqliteRegistry
+
+    registry_path = project_with_objects / ".strata" / "registry.db"
+
+    def read():
+        if not registry_path.exists():
+            return []
+        reg = SqliteRegistry(kind="sqlite", path=str(registry_path))
+        return reg.list_objects()
+
+    return read
 
 
 class TestPreviewCommand:
     """Test strata preview command."""
 
-    def test_preview_discovers_definitions(self, project_dir, monkeypatch):
+    def test_preview_discovers_definitions(
+        self, project_with_objects, console_output, monkeypatch
+    ):
         """Preview should discover and show definitions."""
-        monkeypatch.chdir(project_dir)
+        monkeypatch.chdir(project_with_objects)
 
-        # Capture output by mocking console
-        with patch.object(output_mod.console, "print") as mock_print:
-            # Run preview using cyclopts callable
-            run_cli(["preview"])
+        run_cli(["preview"])
 
         # Should have printed something about the entity
-        calls = [str(c) for c in mock_print.call_args_list]
-        output_str = " ".join(calls)
+        output_str = console_output.getvalue()
         assert "user" in output_str.lower() or "create" in output_str.lower()
 
-    def test_preview_no_definitions(self, tmp_path, monkeypatch):
+    def test_preview_no_definitions(
+        self, project_dir, console_output, monkeypatch
+    ):
         """Preview with no definitions shows no resources."""
-        # Create minimal config
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: empty-project
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
+        monkeypatch.chdir(project_dir)
 
-        with patch.object(output_mod.console, "print") as mock_print:
-            run_cli(["preview"])
+        run_cli(["preview"])
 
         # Should indicate no changes
-        calls = [str(c) for c in mock_print.call_args_list]
-        output_str = " ".join(calls)
+        output_str = console_output.getvalue()
         assert "no" in output_str.lower() or "0" in output_str
 
 
 class TestUpCommand:
     """Test strata up command."""
 
-    def test_up_dry_run_no_apply(self, project_dir, monkeypatch):
+    def test_up_dry_run_no_apply(self, project_with_objects, monkeypatch):
         """--dry-run should preview without applying."""
-        monkeypatch.chdir(project_dir)
+        monkeypatch.chdir(project_with_objects)
 
         with patch.object(output_mod.console, "print"):
             run_cli(["up", "--dry-run"])
@@ -110,9 +81,11 @@ class TestUpCommand:
         # Note: registry.db may be created for reading but should have no objects
         # The key is that no objects were written
 
-    def test_up_with_yes_applies(self, project_dir, monkeypatch):
+    def test_up_with_yes_applies(
+        self, project_with_objects, registry_objects, monkeypatch
+    ):
         """--yes should apply without prompting."""
-        monkeypatch.chdir(project_dir)
+        monkeypatch.chdir(project_with_objects)
 
         with patch.object(output_mod.console, "print"):
             with patch.object(output_mod.console, "input", return_value="n"):
@@ -120,41 +93,48 @@ class TestUpCommand:
                 run_cli(["up", "--yes"])
 
         # Check registry has the entity
-        from strata.infra.backends.sqlite.registry import SqliteRegistry
-
-        registry_path = project_dir / ".strata" / "registry.db"
-        reg = SqliteRegistry(kind="sqlite", path=str(registry_path))
-        reg.initialize()
-
-        objects = reg.list_objects()
-        entity_names = [o.name for o in objects if o.kind == "entity"]
+        entity_names = [
+            o.name for o in registry_objects() if o.kind == "entity"
+        ]
         assert "user" in entity_names
 
-    def test_up_cancelled_on_no(self, project_dir, monkeypatch):
+    def test_up_cancelled_on_no(
+        self, project_with_objects, registry_objects, monkeypatch
+    ):
         """Answering 'n' should cancel apply."""
-        monkeypatch.chdir(project_dir)
+        monkeypatch.chdir(project_with_objects)
 
         with patch.object(output_mod.console, "print"):
             with patch.object(output_mod, "prompt_apply", return_value=False):
                 run_cli(["up"])
 
-        # Registry should exist but be empty (initialized but no objects applied)
-        from strata.infra.backends.sqlite.registry import SqliteRegistry
-
-        registry_path = project_dir / ".strata" / "registry.db"
-        if registry_path.exists():
-            reg = SqliteRegistry(kind="sqlite", path=str(registry_path))
-            reg.initialize()
-            objects = reg.list_objects()
-            assert len(objects) == 0
+        # Registry may exist (initialized) but has no objects applied
+        assert registry_objects() == []
 
 
 class TestUpIdempotency:
     """Test that up is idempotent."""
 
-    def test_second_up_no_changes(self, project_dir, monkeypatch):
+    @pytest.fixture
+    def cached_discovery(self, project_with_objects, monkeypatch):
+        """Discover definitions once and serve them to every ``up`` run."""
+        monkeypatch.chdir(project_with_objects)
+        strata_settings = settings.load_strata_settings(
+            project_with_objects / "strata.yaml"
+        )
+        discovered = discovery.discover_definitions(
+            strata_settings, project_with_objects
+        )
+        token = discovery.discovered_override.set(discovered)
+        yield discovered
+        discovery.discovered_override.reset(token)
+
+    def test_second_up_no_changes(self, cached_discovery):
         """Running up twice should show no changes on second run."""
-        monkeypatch.chdir(project_dir)
+        assert sorted(obj.name for obj in cached_discovery) == [
+            "product",
+            "user",
+        ]
 
         # First up
         with patch.object(output_mod.console, "print"):
@@ -175,3 +155,21 @@ class TestUpIdempotency:
         # Second run should show no changes
         assert len(results) > 0
         assert not results[-1].has_changes
+
+
+class TestProjectDirOverride:
+    """Test running up against a project other than the working directory."""
+
+    def test_up_writes_state_inside_project(
+        self, project_with_objects, use_project, tmp_path, monkeypatch
+    ):
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        monkeypatch.chdir(elsewhere)
+        use_project(project_with_objects)
+
+        with patch.object(output_mod.console, "print"):
+            run_cli(["up", "--yes"])
+
+        assert (project_with_objects / ".strata" / "registry.db").exists()
+        assert not (elsewhere / ".strata").exists()
@@ -1,35 +1,34 @@
 """Tests for strata validate and compile commands."""
 
 import json
+import os
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from strata.cli import app
+import strata.discovery as discovery
 import strata.output as output_mod
+import strata.settings as settings
 import strata.validation as validation
 
 
-def run_cli(args: list[str]) -> None:
-    """Run CLI command, catching successful exit."""
-    try:
-        app(args)
-    except SystemExit as e:
-        if e.code != 0:
-            raise
+# Keep the module on one xdist worker so its module-scoped fixtures are
+# built once (effective with ``--dist=loadgroup``).
+pytestmark = pytest.mark.xdist_group(name=__name__)
 
 
-@pytest.fixture
-def valid_project(tmp_path):
-    """Create a valid project with matching references.
+def run_cli(args: list[str]) -> None:
+    """Run CLI command in-process without cyclopts calling ``sys.exit``.
 
-    Note: Entity is only defined once in entities/ to avoid duplicate errors.
-    The feature table references the entity by name (in real projects,
-    entities would be imported from a shared module).
+    Parse errors surface as cyclopts exceptions; command failures still
+    raise ``SystemExit(1)`` from the command itself.
     """
-    config = tmp_path / "strata.yaml"
-    config.write_text(
-        """
+    app(args, result_action="return_value", exit_on_error=False)
+
+
+_STRATA_YAML = b"""
 name: test-project
 default_env: dev
 schedules:
@@ -45,24 +44,13 @@ environments:
       path: .strata/data
       catalog: features
 """
-    )
 
-    # Create entity (only in entities/ to avoid duplicates)
-    entities_dir = tmp_path / "entities"
-    entities_dir.mkdir()
-    (entities_dir / "user.py").write_text(
-        """
+_USER_ENTITY = b"""
 import strata.core as core
 user = core.Entity(name="user", join_keys=["user_id"])
 """
-    )
 
-    # Create feature table that references the entity
-    # In a real project, it would import the entity from entities/user.py
-    tables_dir = tmp_path / "tables"
-    tables_dir.mkdir()
-    (tables_dir / "user_features.py").write_text(
-        """
+_USER_FEATURES = b"""
 import strata.core as core
 import strata.sources as sources
 from strata.infra.backends.local.storage import LocalSourceConfig
@@ -84,38 +72,8 @@ user_features = core.FeatureTable(
     schedule="hourly",
 )
 """
-    )
-
-    return tmp_path
-
 
-@pytest.fixture
-def invalid_project(tmp_path):
-    """Create a project with validation errors."""
-    config = tmp_path / "strata.yaml"
-    config.write_text(
-        """
-name: invalid-project
-default_env: dev
-schedules:
-  - hourly
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-    )
-
-    # Create feature table with invalid schedule
-    tables_dir = tmp_path / "tables"
-    tables_dir.mkdir()
-    (tables_dir / "bad_table.py").write_text(
-        """
+_BAD_TABLE = b"""
 import strata.core as core
 import strata.sources as sources
 from strata.infra.backends.local.storage import LocalSourceConfig
@@ -137,15 +95,77 @@ bad_table = core.FeatureTable(
     schedule="invalid_schedule",  # Not in allowed list
 )
 """
+
+
+@pytest.fixture(scope="module")
+def _template_files(tmp_path_factory):
+    """Write every project file once; fixtures hardlink the ones they need."""
+    root = tmp_path_factory.mktemp("validate_templates")
+    files = {
+        "strata.yaml": _STRATA_YAML,
+        "entities/user.py": _USER_ENTITY,
+        "tables/user_features.py": _USER_FEATURES,
+        "tables/bad_table.py": _BAD_TABLE,
+    }
+    for relpath, content in files.items():
+        path = root / relpath
+        path.parent.mkdir(exist_ok=True)
+        # Small, known-size payloads: write unbuffered in one syscall
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+    return root
+
+
+def _link_project(templates: Path, dest: Path, *relpaths: str) -> Path:
+    """Hardlink template files into ``dest``.
+
+    The CLI only reads definition files (compile writes under
+    ``.strata/``), so sharing inodes between projects is safe.
+    """
+    for relpath in relpaths:
+        target = dest / relpath
+        target.parent.mkdir(exist_ok=True)
+        os.link(templates / relpath, target)
+    return dest
+
+
+@pytest.fixture(scope="module")
+def valid_project(tmp_path_factory, _template_files):
+    """Create a valid project with matching references.
+
+    Note: Entity is only defined once in entities/ to avoid duplicate errors.
+    The feature table references the entity by name (in real projects,
+    entities would be imported from a shared module).
+
+    Module-scoped: ``validate`` only reads the tree, so tests share it.
+    """
+    return _link_project(
+        _template_files,
+        tmp_path_factory.mktemp("valid_project"),
+        "strata.yaml",
+        "entities/user.py",
+        "tables/user_features.py",
     )
 
-    return tmp_path
+
+@pytest.fixture(scope="module")
+def invalid_project(tmp_path_factory, _template_files):
+    """Create a project with validation errors (module-scoped, read-only)."""
+    return _link_project(
+        _template_files,
+        tmp_path_factory.mktemp("invalid_project"),
+        "strata.yaml",
+        "tables/bad_table.py",
+    )
 
 
 class TestValidateCommand:
     """Test strata validate command."""
 
-    def test_validate_valid_project_passes(self, valid_project, monkeypatch):
+    def test_validate_valid_project_passes(self, valid_project, use_project):
         """Valid project should pass validation.
 
         Note: Validation currently treats duplicate entity definitions (same name,
@@ -153,7 +173,7 @@ class TestValidateCommand:
         In the future, we may want to allow identical duplicates and only error on
         conflicting specs.
         """
-        monkeypatch.chdir(valid_project)
+        use_project(valid_project)
 
         # Note: Currently this raises SystemExit(1) due to duplicate entity detection.
         # The duplicate detection is intentional - entities should be defined once
@@ -171,10 +191,10 @@ class TestValidateCommand:
             assert exc_info.value.code == 1
 
     def test_validate_invalid_schedule_fails(
-        self, invalid_project, monkeypatch
+        self, invalid_project, use_project
     ):
         """Invalid schedule should cause validation error."""
-        monkeypatch.chdir(invalid_project)
+        use_project(invalid_project)
 
         with patch.object(output_mod.console, "print"):
             with pytest.raises(SystemExit) as exc_info:
@@ -186,7 +206,7 @@ class TestValidateCommand:
 class TestValidationModule:
     """Test validation module directly."""
 
-    def test_duplicate_entity_error(self, tmp_path, monkeypatch):
+    def test_duplicate_entity_error(self, tmp_path):
         """Duplicate entity names should be an error."""
         config = tmp_path / "strata.yaml"
         config.write_text(
@@ -221,10 +241,9 @@ user = core.Entity(name="user", join_keys=["id"])  # Same name!
 """
         )
 
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
+        strata_settings = settings.load_strata_settings(
+            tmp_path / "strata.yaml"
+        )
 
         result = validation.validate_definitions(strata_settings)
 
@@ -232,63 +251,42 @@ user = core.Entity(name="user", join_keys=["id"])  # Same name!
         assert any("duplicate" in e.message.lower() for e in result.errors)
 
 
+@pytest.fixture(scope="module")
+def _compile_discovered(tmp_path_factory, _template_files):
+    """Definitions discovered once from a compile project template."""
+    root = _link_project(
+        _template_files,
+        tmp_path_factory.mktemp("compile_template"),
+        "strata.yaml",
+        "tables/user_features.py",
+    )
+    strata_settings = settings.load_strata_settings(root / "strata.yaml")
+    return discovery.discover_definitions(strata_settings)
+
+
 class TestCompileCommand:
     """Test strata compile command."""
 
     @pytest.fixture
-    def compile_project(self, tmp_path):
-        """Create a project for compile tests (no entity duplication)."""
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: compile-project
-default_env: dev
-schedules:
-  - hourly
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-
-        # Create feature table only (entity defined inline, no entities/ dir)
-        tables_dir = tmp_path / "tables"
-        tables_dir.mkdir()
-        (tables_dir / "user_features.py").write_text(
-            """
-import strata.core as core
-import strata.sources as sources
-from strata.infra.backends.local.storage import LocalSourceConfig
-
-user = core.Entity(name="user", join_keys=["user_id"])
-
-source = sources.BatchSource(
-    name="transactions",
-    config=LocalSourceConfig(path="./data.parquet"),
-    timestamp_field="event_ts",
-)
+    def compile_project(self, tmp_path, _template_files, _compile_discovered):
+        """Create a project for compile tests (no entities/ dir).
 
-user_features = core.FeatureTable(
-    name="user_features",
-    source=source,
-    entity=user,
-    timestamp_field="event_ts",
-    schedule="hourly",
-)
-"""
+        Compile only needs the project root from the config, so the
+        cached definitions are served via ``discovered_override``.
+        """
+        project = _link_project(
+            _template_files,
+            tmp_path,
+            "strata.yaml",
+            "tables/user_features.py",
         )
+        token = discovery.discovered_override.set(_compile_discovered)
+        yield project
+        discovery.discovered_override.reset(token)
 
-        return tmp_path
-
-    def test_compile_creates_files(self, compile_project, monkeypatch):
+    def test_compile_creates_files(self, compile_project, use_project):
         """Compile should create query.sql and lineage.json."""
-        monkeypatch.chdir(compile_project)
+        use_project(compile_project)
 
         with patch.object(output_mod.console, "print"):
             run_cli(["compile"])
@@ -306,9 +304,19 @@ user_features = core.FeatureTable(
         assert lineage["table"] == "user_features"
         assert lineage["entity"] == "user"
 
-    def test_compile_specific_table(self, compile_project, monkeypatch):
+    def test_compile_persists_rendered_sql(self, compile_project, use_project):
+        """Compile keeps rendered SQL in the project's compile cache."""
+        use_project(compile_project)
+
+        with patch.object(output_mod.console, "print"):
+            run_cli(["compile"])
+
+        cache_dir = compile_project / ".strata" / "cache" / "compile"
+        assert list(cache_dir.glob("*.json"))
+
+    def test_compile_specific_table(self, compile_project, use_project):
         """Compile with table name should only compile that table."""
-        monkeypatch.chdir(compile_project)
+        use_project(compile_project)
 
         with patch.object(output_mod.console, "print"):
             run_cli(["compile", "user_features"])
@@ -319,10 +327,10 @@ user_features = core.FeatureTable(
         assert compiled_dir.exists()
 
     def test_compile_nonexistent_table_fails(
-        self, compile_project, monkeypatch
+        self, compile_project, use_project
     ):
         """Compile with unknown table name should fail."""
-        monkeypatch.chdir(compile_project)
+        use_project(compile_project)
 
         with patch.object(output_mod.console, "print"):
             with pytest.raises(SystemExit) as exc_info:
@@ -1,29 +1,45 @@
 """Tests for compile output generation."""
 
 import json
+import re
 from datetime import timedelta
 
 import pytest
 
 import strata.compile_output as compile_output
-import strata.compiler as compiler_mod
 import strata.core as core
 import strata.discovery as discovery
+import strata.registry as reg_types
 import strata.sources as sources
 from strata.infra.backends.local.storage import LocalSourceConfig
 
 
+# Compiler modules share one xdist worker (with ``--dist=loadgroup``) so
+# the session compiler and the process-wide compile cache stay warm.
+pytestmark = pytest.mark.xdist_group(name="compile")
+
+
+# Shared window values, reused by every aggregate definition
+_D90 = timedelta(days=90)
+
+# Shared field definitions; tests never mutate them
+_FIELD_F64 = core.Field(dtype="float64")
+
+# Short spec hash as written to build_context.json
+_HEX8 = re.compile(r"[0-9a-f]{8}")
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_entity():
     return core.Entity(name="user", join_keys=["user_id"])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def transaction_source():
     return sources.BatchSource(
         name="transactions",
@@ -32,7 +48,7 @@ def transaction_source():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def feature_table(user_entity, transaction_source):
     table = core.FeatureTable(
         name="user_transactions",
@@ -42,22 +58,21 @@ def feature_table(user_entity, transaction_source):
     )
     table.aggregate(
         name="spend_90d",
-        field=core.Field(dtype="float64"),
+        field=_FIELD_F64,
         column="amount",
         function="sum",
-        window=timedelta(days=90),
+        window=_D90,
     )
     return table
 
 
-@pytest.fixture
-def compiled_query(feature_table):
+@pytest.fixture(scope="module")
+def compiled_query(ibis_compiler, feature_table):
     """Compile the feature table using the real compiler."""
-    ibis_compiler = compiler_mod.IbisCompiler()
     return ibis_compiler.compile_table(feature_table)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def disc_object(feature_table):
     """Create a DiscoveredObject for the feature table."""
     return discovery.DiscoveredObject(
@@ -68,26 +83,29 @@ def disc_object(feature_table):
     )
 
 
+@pytest.fixture(scope="module")
+def compiled_output_dir(tmp_path_factory, compiled_query, disc_object):
+    """Write the compile output once; tests only read the artifacts."""
+    return compile_output.write_compile_output(
+        compiled=compiled_query,
+        disc=disc_object,
+        output_dir=tmp_path_factory.mktemp("compiled"),
+        env="dev",
+        strata_version="0.1.0",
+        write_ibis_expr=True,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Output directory creation
 # ---------------------------------------------------------------------------
 
 
 class TestOutputDirectory:
-    def test_creates_output_directory_per_table(
-        self, tmp_path, compiled_query, disc_object
-    ):
+    def test_creates_output_directory_per_table(self, compiled_output_dir):
         """Output directory should be created for each table."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
-        )
-
-        assert table_dir.exists()
-        assert table_dir.name == "user_transactions"
+        assert compiled_output_dir.exists()
+        assert compiled_output_dir.name == "user_transactions"
 
     def test_creates_nested_directory(
         self, tmp_path, compiled_query, disc_object
@@ -111,17 +129,9 @@ class TestOutputDirectory:
 
 
 class TestQuerySql:
-    def test_writes_query_sql(self, tmp_path, compiled_query, disc_object):
+    def test_writes_query_sql(self, compiled_output_dir):
         """Should write query.sql with compiled SQL."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
-        )
-
-        query_path = table_dir / "query.sql"
+        query_path = compiled_output_dir / "query.sql"
         assert query_path.exists()
 
         content = query_path.read_text()
@@ -129,19 +139,9 @@ class TestQuerySql:
         assert "user_transactions" in content
         assert "tables/user_features.py" in content
 
-    def test_query_sql_contains_real_sql(
-        self, tmp_path, compiled_query, disc_object
-    ):
+    def test_query_sql_contains_real_sql(self, compiled_output_dir):
         """query.sql should contain actual compiled SQL, not placeholders."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
-        )
-
-        content = (table_dir / "query.sql").read_text()
+        content = (compiled_output_dir / "query.sql").read_text()
         # Should contain real SQL from the compiler (has SUM for aggregate)
         assert "SUM" in content
         assert "spend_90d" in content
@@ -153,22 +153,49 @@ class TestQuerySql:
 
 
 class TestIbisExpr:
-    def test_writes_ibis_expr(self, tmp_path, compiled_query, disc_object):
+    def test_writes_ibis_expr(self, compiled_output_dir):
         """Should write ibis_expr.txt with Ibis expression."""
+        ibis_path = compiled_output_dir / "ibis_expr.txt"
+        assert ibis_path.exists()
+
+        content = ibis_path.read_text()
+        # Ibis expression repr should contain table/aggregation info
+        assert len(content) > 0
+
+    def test_skips_ibis_expr_when_disabled(
+        self, tmp_path, compiled_query, disc_object
+    ):
+        """write_ibis_expr=False should leave ibis_expr.txt out."""
         table_dir = compile_output.write_compile_output(
             compiled=compiled_query,
             disc=disc_object,
             output_dir=tmp_path,
             env="dev",
             strata_version="0.1.0",
+            write_ibis_expr=False,
         )
 
-        ibis_path = table_dir / "ibis_expr.txt"
-        assert ibis_path.exists()
+        assert not (table_dir / "ibis_expr.txt").exists()
+        assert (table_dir / "query.sql").exists()
 
-        content = ibis_path.read_text()
-        # Ibis expression repr should contain table/aggregation info
-        assert len(content) > 0
+    def test_disabled_removes_stale_ibis_expr(
+        self, tmp_path, compiled_query, disc_object
+    ):
+        """Skipping ibis_expr.txt drops one left by an earlier compile."""
+        stale = tmp_path / compiled_query.table_name / "ibis_expr.txt"
+        stale.parent.mkdir()
+        stale.write_text("old expression")
+
+        compile_output.write_compile_output(
+            compiled=compiled_query,
+            disc=disc_object,
+            output_dir=tmp_path,
+            env="dev",
+            strata_version="0.1.0",
+            write_ibis_expr=False,
+        )
+
+        assert not stale.exists()
 
 
 # ---------------------------------------------------------------------------
@@ -177,17 +204,9 @@ class TestIbisExpr:
 
 
 class TestLineageJson:
-    def test_writes_lineage_json(self, tmp_path, compiled_query, disc_object):
+    def test_writes_lineage_json(self, compiled_output_dir):
         """Should write lineage.json with source tables."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
-        )
-
-        lineage_path = table_dir / "lineage.json"
+        lineage_path = compiled_output_dir / "lineage.json"
         assert lineage_path.exists()
 
         lineage = json.loads(lineage_path.read_text())
@@ -197,19 +216,9 @@ class TestLineageJson:
         assert lineage["entity"] == "user"
         assert "spend_90d" in lineage["aggregates"]
 
-    def test_lineage_json_has_source_info(
-        self, tmp_path, compiled_query, disc_object
-    ):
+    def test_lineage_json_has_source_info(self, compiled_output_dir):
         """Lineage should include source reference."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
-        )
-
-        lineage = json.loads((table_dir / "lineage.json").read_text())
+        lineage = json.loads((compiled_output_dir / "lineage.json").read_text())
         assert lineage["source"]["type"] == "batch_source"
         assert lineage["source"]["name"] == "transactions"
 
@@ -244,50 +253,39 @@ class TestBuildContextJson:
         assert "table_spec_hash" in context
         assert context["source"] is not None
 
-    def test_build_context_compiled_at_is_iso(
-        self, tmp_path, compiled_query, disc_object
-    ):
+    def test_build_context_compiled_at_is_iso(self, compiled_output_dir):
         """compiled_at should be an ISO timestamp."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
+        context = json.loads(
+            (compiled_output_dir / "build_context.json").read_text()
         )
-
-        context = json.loads((table_dir / "build_context.json").read_text())
         # ISO format should contain T separator and timezone info
         assert "T" in context["compiled_at"]
 
-    def test_build_context_table_spec_hash(
-        self, tmp_path, compiled_query, disc_object
-    ):
+    def test_build_context_table_spec_hash(self, compiled_output_dir):
         """table_spec_hash should be a short hex string."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
+        context = json.loads(
+            (compiled_output_dir / "build_context.json").read_text()
         )
-
-        context = json.loads((table_dir / "build_context.json").read_text())
         spec_hash = context["table_spec_hash"]
-        assert len(spec_hash) == 8
-        assert all(c in "0123456789abcdef" for c in spec_hash)
+        assert _HEX8.fullmatch(spec_hash)
 
-    def test_build_context_registry_serial_optional(
-        self, tmp_path, compiled_query, disc_object
+    def test_build_context_hash_prefixes_registry_hash(
+        self, compiled_output_dir, disc_object
     ):
-        """registry_serial should be None when not provided."""
-        table_dir = compile_output.write_compile_output(
-            compiled=compiled_query,
-            disc=disc_object,
-            output_dir=tmp_path,
-            env="dev",
-            strata_version="0.1.0",
+        """table_spec_hash should match the registry hash shown by ``ls``."""
+        context = json.loads(
+            (compiled_output_dir / "build_context.json").read_text()
+        )
+        spec = discovery.serialize_to_spec(disc_object.obj, disc_object.kind)
+        registry_hash = reg_types.compute_spec_hash(
+            discovery.spec_to_json(spec)
         )
 
-        context = json.loads((table_dir / "build_context.json").read_text())
+        assert context["table_spec_hash"] == registry_hash[:8]
+
+    def test_build_context_registry_serial_optional(self, compiled_output_dir):
+        """registry_serial should be None when not provided."""
+        context = json.loads(
+            (compiled_output_dir / "build_context.json").read_text()
+        )
         assert context["registry_serial"] is None
@@ -1,5 +1,8 @@
 """Tests for the Ibis-based feature compiler."""
 
+import dataclasses
+import json
+import os
 from datetime import timedelta
 
 import pytest
@@ -11,22 +14,44 @@ import strata.sources as sources
 from strata.infra.backends.local.storage import LocalSourceConfig
 
 
+# Compiler modules share one xdist worker (with ``--dist=loadgroup``) so
+# the session compiler and the process-wide compile cache stay warm.
+pytestmark = pytest.mark.xdist_group(name="compile")
+
+
+# Shared window values, reused by every aggregate definition
+_D7 = timedelta(days=7)
+_D30 = timedelta(days=30)
+_D90 = timedelta(days=90)
+
+# Shared field definitions; tests never mutate them
+_FIELD_F64 = core.Field(dtype="float64")
+_FIELD_I64 = core.Field(dtype="int64")
+_FIELD_BOOL = core.Field(dtype="bool")
+
+
+def _assert_contains_all(sql: str, fragments: list[str]) -> None:
+    """Assert every fragment occurs in ``sql``, reporting all that are missing."""
+    missing = [f for f in fragments if f not in sql]
+    assert not missing, f"missing from SQL: {missing}"
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_entity():
     return core.Entity(name="user", join_keys=["user_id"])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def multi_key_entity():
     return core.Entity(name="user_device", join_keys=["user_id", "device_id"])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def transaction_source():
     return sources.BatchSource(
         name="transactions",
@@ -35,20 +60,19 @@ def transaction_source():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def source_schema():
-    """Realistic source schema for compilation tests."""
-    return {
-        "user_id": "string",
-        "amount": "float64",
-        "event_timestamp": "datetime",
-        "status": "string",
-        "merchant_id": "string",
-    }
+    """Realistic source schema, pre-frozen to hashable (column, dtype) pairs."""
+    return (
+        ("user_id", "string"),
+        ("amount", "float64"),
+        ("event_timestamp", "datetime"),
+        ("status", "string"),
+        ("merchant_id", "string"),
+    )
 
 
-@pytest.fixture
-def feature_table(user_entity, transaction_source):
+def _make_feature_table(user_entity, transaction_source):
     return core.FeatureTable(
         name="user_transactions",
         source=transaction_source,
@@ -58,8 +82,9 @@ def feature_table(user_entity, transaction_source):
 
 
 @pytest.fixture
-def ibis_compiler():
-    return compiler.IbisCompiler()
+def feature_table(user_entity, transaction_source):
+    """Fresh table per test, so tests can add features freely."""
+    return _make_feature_table(user_entity, transaction_source)
 
 
 # ---------------------------------------------------------------------------
@@ -71,10 +96,10 @@ class TestCompiledQuery:
     def test_fields_present(self, feature_table, ibis_compiler, source_schema):
         feature_table.aggregate(
             name="spend_90d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=90),
+            window=_D90,
         )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
@@ -90,10 +115,10 @@ class TestCompiledQuery:
     ):
         feature_table.aggregate(
             name="spend_90d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=90),
+            window=_D90,
         )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
@@ -133,45 +158,55 @@ class TestAggregateCompilation:
     ):
         feature_table.aggregate(
             name="spend_90d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=90),
+            window=_D90,
         )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
         )
 
-        assert "SUM" in result.sql
-        assert "spend_90d" in result.sql
-        assert "PARTITION BY" in result.sql
-        assert "user_id" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "SUM",
+                "spend_90d",
+                "PARTITION BY",
+                "user_id",
+            ],
+        )
 
     def test_multiple_aggregates(
         self, feature_table, ibis_compiler, source_schema
     ):
         feature_table.aggregate(
             name="spend_90d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=90),
+            window=_D90,
         )
         feature_table.aggregate(
             name="txn_count_30d",
-            field=core.Field(dtype="int64"),
+            field=_FIELD_I64,
             column="amount",
             function="count",
-            window=timedelta(days=30),
+            window=_D30,
         )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
         )
 
-        assert "SUM" in result.sql
-        assert "COUNT" in result.sql
-        assert "spend_90d" in result.sql
-        assert "txn_count_30d" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "SUM",
+                "COUNT",
+                "spend_90d",
+                "txn_count_30d",
+            ],
+        )
 
     def test_different_windows_use_range(
         self, feature_table, ibis_compiler, source_schema
@@ -179,25 +214,30 @@ class TestAggregateCompilation:
         """Aggregates with different windows should use RANGE BETWEEN."""
         feature_table.aggregate(
             name="spend_90d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=90),
+            window=_D90,
         )
         feature_table.aggregate(
             name="spend_30d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=30),
+            window=_D30,
         )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
         )
 
-        assert "RANGE BETWEEN" in result.sql
-        assert "90" in result.sql
-        assert "30" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "RANGE BETWEEN",
+                "90",
+                "30",
+            ],
+        )
 
     def test_multi_join_key_entity(
         self, multi_key_entity, transaction_source, ibis_compiler
@@ -210,10 +250,10 @@ class TestAggregateCompilation:
         )
         table.aggregate(
             name="event_count",
-            field=core.Field(dtype="int64"),
+            field=_FIELD_I64,
             column="amount",
             function="count",
-            window=timedelta(days=30),
+            window=_D30,
         )
         schema = {
             "user_id": "string",
@@ -223,40 +263,41 @@ class TestAggregateCompilation:
         }
         result = ibis_compiler.compile_table(table, source_schema=schema)
 
-        assert "user_id" in result.sql
-        assert "device_id" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "user_id",
+                "device_id",
+            ],
+        )
 
-    @pytest.mark.parametrize(
-        "function,sql_fragment",
-        [
-            ("sum", "SUM"),
-            ("count", "COUNT"),
-            ("avg", "AVG"),
-            ("min", "MIN"),
-            ("max", "MAX"),
-            ("count_distinct", "COUNT(DISTINCT"),
-        ],
-    )
     def test_aggregation_functions(
-        self,
-        feature_table,
-        ibis_compiler,
-        source_schema,
-        function,
-        sql_fragment,
+        self, feature_table, ibis_compiler, source_schema
     ):
-        feature_table.aggregate(
-            name="result",
-            field=core.Field(dtype="float64"),
-            column="amount",
-            function=function,
-            window=timedelta(days=90),
-        )
+        """Every supported function compiles, batched into one table."""
+        fragments = {
+            "sum": "SUM",
+            "count": "COUNT",
+            "avg": "AVG",
+            "min": "MIN",
+            "max": "MAX",
+            "count_distinct": "COUNT(DISTINCT",
+        }
+        for function in fragments:
+            feature_table.aggregate(
+                name=f"res_{function}",
+                field=_FIELD_F64,
+                column="amount",
+                function=function,
+                window=_D90,
+            )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
         )
 
-        assert sql_fragment in result.sql
+        for function, sql_fragment in fragments.items():
+            assert sql_fragment in result.sql
+            assert f"res_{function}" in result.sql
 
     def test_unsupported_function_raises(self, feature_table):
         with pytest.raises(
@@ -264,10 +305,10 @@ class TestAggregateCompilation:
         ):
             feature_table.aggregate(
                 name="bad",
-                field=core.Field(dtype="float64"),
+                field=_FIELD_F64,
                 column="amount",
                 function="median",
-                window=timedelta(days=30),
+                window=_D30,
             )
 
 
@@ -278,7 +319,7 @@ class TestAggregateCompilation:
 
 class TestCustomFeatureCompilation:
     def test_custom_feature(self, feature_table, ibis_compiler, source_schema):
-        @feature_table.feature(name="is_big", field=core.Field(dtype="bool"))
+        @feature_table.feature(name="is_big", field=_FIELD_BOOL)
         def is_big(t):
             return t.amount > 100
 
@@ -286,19 +327,22 @@ class TestCustomFeatureCompilation:
             feature_table, source_schema=source_schema
         )
 
-        assert "is_big" in result.sql
-        assert "100" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "is_big",
+                "100",
+            ],
+        )
 
     def test_multiple_custom_features(
         self, feature_table, ibis_compiler, source_schema
     ):
-        @feature_table.feature(name="is_big", field=core.Field(dtype="bool"))
+        @feature_table.feature(name="is_big", field=_FIELD_BOOL)
         def is_big(t):
             return t.amount > 100
 
-        @feature_table.feature(
-            name="amount_doubled", field=core.Field(dtype="float64")
-        )
+        @feature_table.feature(name="amount_doubled", field=_FIELD_F64)
         def amount_doubled(t):
             return t.amount * 2
 
@@ -306,8 +350,13 @@ class TestCustomFeatureCompilation:
             feature_table, source_schema=source_schema
         )
 
-        assert "is_big" in result.sql
-        assert "amount_doubled" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "is_big",
+                "amount_doubled",
+            ],
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -327,8 +376,13 @@ class TestTransformCompilation:
             feature_table, source_schema=source_schema
         )
 
-        assert "amount" in result.sql
-        assert "> 0" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "amount",
+                "> 0",
+            ],
+        )
 
     def test_transform_with_aggregate(
         self, feature_table, ibis_compiler, source_schema
@@ -341,19 +395,24 @@ class TestTransformCompilation:
 
         feature_table.aggregate(
             name="spend_90d",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="sum",
-            window=timedelta(days=90),
+            window=_D90,
         )
         result = ibis_compiler.compile_table(
             feature_table, source_schema=source_schema
         )
 
         # Both the filter and the aggregate should be in the SQL
-        assert "completed" in result.sql
-        assert "SUM" in result.sql
-        assert "spend_90d" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "completed",
+                "SUM",
+                "spend_90d",
+            ],
+        )
 
     def test_multiple_transforms_applied_in_order(
         self, feature_table, ibis_compiler, source_schema
@@ -371,8 +430,13 @@ class TestTransformCompilation:
         )
 
         # Both filters should be present
-        assert "> 0" in result.sql
-        assert "active" in result.sql
+        _assert_contains_all(
+            result.sql,
+            [
+                "> 0",
+                "active",
+            ],
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -395,17 +459,17 @@ class TestSQLDeterminism:
             )
             table.aggregate(
                 name="spend_90d",
-                field=core.Field(dtype="float64"),
+                field=_FIELD_F64,
                 column="amount",
                 function="sum",
-                window=timedelta(days=90),
+                window=_D90,
             )
             table.aggregate(
                 name="txn_count_30d",
-                field=core.Field(dtype="int64"),
+                field=_FIELD_I64,
                 column="amount",
                 function="count",
-                window=timedelta(days=30),
+                window=_D30,
             )
             return table
 
@@ -415,16 +479,286 @@ class TestSQLDeterminism:
             "event_timestamp": "datetime",
         }
 
+        # Clear before each compile so both results are rendered from
+        # scratch rather than served by the compile cache
+        compiler.clear_compile_cache()
         result1 = ibis_compiler.compile_table(
             _make_table(), source_schema=schema
         )
+        compiler.clear_compile_cache()
         result2 = ibis_compiler.compile_table(
             _make_table(), source_schema=schema
         )
 
+        assert result2.ibis_expr is not result1.ibis_expr
         assert result1.sql == result2.sql
 
 
+# ---------------------------------------------------------------------------
+# Compile cache
+# ---------------------------------------------------------------------------
+
+
+class TestCompileCache:
+    def test_mapping_and_pairs_share_cache_entry(
+        self, feature_table, ibis_compiler, source_schema
+    ):
+        from_pairs = ibis_compiler.compile_table(
+            feature_table, source_schema=source_schema
+        )
+        from_mapping = ibis_compiler.compile_table(
+            feature_table, source_schema=dict(source_schema)
+        )
+
+        assert from_mapping.ibis_expr is from_pairs.ibis_expr
+
+    def test_identical_spec_returns_cached_query(
+        self, user_entity, transaction_source, ibis_compiler
+    ):
+        def _make_table():
+            return core.FeatureTable(
+                name="cached_transactions",
+                source=transaction_source,
+                entity=user_entity,
+                timestamp_field="event_timestamp",
+            )
+
+        first = ibis_compiler.compile_table(_make_table())
+        second = compiler.IbisCompiler().compile_table(_make_table())
+
+        assert second.ibis_expr is first.ibis_expr
+
+    def test_changed_spec_recompiles(
+        self, user_entity, transaction_source, ibis_compiler
+    ):
+        table = core.FeatureTable(
+            name="growing_transactions",
+            source=transaction_source,
+            entity=user_entity,
+            timestamp_field="event_timestamp",
+        )
+        before = ibis_compiler.compile_table(table)
+
+        table.aggregate(
+            name="spend_7d",
+            field=_FIELD_F64,
+            column="amount",
+            function="sum",
+            window=_D7,
+        )
+        after = ibis_compiler.compile_table(table)
+
+        assert after.ibis_expr is not before.ibis_expr
+        assert "spend_7d" in after.sql
+        assert "spend_7d" not in before.sql
+
+    def test_distinct_transforms_are_not_shared(
+        self, user_entity, transaction_source, ibis_compiler
+    ):
+        def _make_table(min_amount):
+            table = core.FeatureTable(
+                name="filtered_cache_transactions",
+                source=transaction_source,
+                entity=user_entity,
+                timestamp_field="event_timestamp",
+            )
+
+            @table.transform()
+            def keep_large(t):
+                return t.filter(t.amount > min_amount)
+
+            return table
+
+        schema = {"user_id": "string", "amount": "float64"}
+        small = ibis_compiler.compile_table(
+            _make_table(10), source_schema=schema
+        )
+        large = ibis_compiler.compile_table(
+            _make_table(1000), source_schema=schema
+        )
+
+        assert "1000" in large.sql
+        assert "1000" not in small.sql
+
+    def test_callers_cannot_mutate_cached_entry(
+        self, feature_table, ibis_compiler
+    ):
+        first = ibis_compiler.compile_table(feature_table)
+        first.source_tables.append("poisoned")
+
+        second = ibis_compiler.compile_table(feature_table)
+
+        assert second.source_tables == ["transactions"]
+
+    def test_subclass_overrides_are_honoured(
+        self, feature_table, ibis_compiler
+    ):
+        class _TaggingCompiler(compiler.IbisCompiler):
+            def _compile(self, table, source_schema, date_range):
+                compiled = super()._compile(table, source_schema, date_range)
+                return dataclasses.replace(
+                    compiled, sql=f"-- tagged\n{compiled.sql}"
+                )
+
+        plain = ibis_compiler.compile_table(feature_table)
+        tagged = _TaggingCompiler().compile_table(feature_table)
+
+        assert not plain.sql.startswith("-- tagged")
+        assert tagged.sql.startswith("-- tagged")
+
+
+class TestPersistentCache:
+    @pytest.fixture(autouse=True)
+    def _cold_memory_cache(self):
+        """Start from an empty in-process cache so compiles reach disk."""
+        compiler.clear_compile_cache()
+
+    @pytest.fixture
+    def table(self, user_entity, transaction_source):
+        table = core.FeatureTable(
+            name="persisted_transactions",
+            source=transaction_source,
+            entity=user_entity,
+            timestamp_field="event_timestamp",
+        )
+        table.aggregate(
+            name="spend_7d",
+            field=_FIELD_F64,
+            column="amount",
+            function="sum",
+            window=_D7,
+        )
+        return table
+
+    def test_writes_entry_per_compile(self, table, tmp_path, source_schema):
+        result = compiler.IbisCompiler(
+            persistent_cache_dir=tmp_path
+        ).compile_table(table, source_schema=source_schema)
+
+        (entry,) = tmp_path.glob("*.json")
+        assert json.loads(entry.read_text())["sql"] == result.sql
+
+    def test_reuses_sql_from_disk(self, table, tmp_path, source_schema):
+        ibis_compiler = compiler.IbisCompiler(persistent_cache_dir=tmp_path)
+        ibis_compiler.compile_table(table, source_schema=source_schema)
+        (entry,) = tmp_path.glob("*.json")
+        data = json.loads(entry.read_text())
+        entry.write_text(json.dumps({**data, "sql": "SELECT 1"}))
+        compiler.clear_compile_cache()
+
+        result = ibis_compiler.compile_table(table, source_schema=source_schema)
+
+        assert result.sql == "SELECT 1"
+        assert result.ibis_expr is not None
+
+    @pytest.mark.parametrize(
+        "version_field", ["ibis_version", "strata_version"]
+    )
+    def test_stale_entry_is_rendered_again(
+        self, table, tmp_path, source_schema, version_field
+    ):
+        ibis_compiler = compiler.IbisCompiler(persistent_cache_dir=tmp_path)
+        ibis_compiler.compile_table(table, source_schema=source_schema)
+        (entry,) = tmp_path.glob("*.json")
+        data = json.loads(entry.read_text())
+        entry.write_text(
+            json.dumps({**data, version_field: "0.0", "sql": "SELECT 1"})
+        )
+        compiler.clear_compile_cache()
+
+        result = ibis_compiler.compile_table(table, source_schema=source_schema)
+
+        assert "spend_7d" in result.sql
+        assert json.loads(entry.read_text())["sql"] == result.sql
+
+    def test_unwritable_cache_dir_does_not_fail_compile(
+        self, table, tmp_path, source_schema
+    ):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+
+        result = compiler.IbisCompiler(
+            persistent_cache_dir=blocker / "cache"
+        ).compile_table(table, source_schema=source_schema)
+
+        assert "spend_7d" in result.sql
+
+    def test_oldest_entries_are_pruned(
+        self, table, tmp_path, source_schema, monkeypatch
+    ):
+        monkeypatch.setattr(compiler, "_PERSISTENT_CACHE_MAX_ENTRIES", 1)
+        ibis_compiler = compiler.IbisCompiler(persistent_cache_dir=tmp_path)
+        ibis_compiler.compile_table(table, source_schema=source_schema)
+        (first,) = tmp_path.glob("*.json")
+        os.utime(first, ns=(0, 0))
+
+        ibis_compiler.compile_table(table)
+
+        (remaining,) = tmp_path.glob("*.json")
+        assert remaining != first
+
+    def test_memory_hit_without_cache_dir_still_persists(
+        self, table, tmp_path, source_schema
+    ):
+        compiler.IbisCompiler().compile_table(
+            table, source_schema=source_schema
+        )
+        compiler.IbisCompiler(persistent_cache_dir=tmp_path).compile_table(
+            table, source_schema=source_schema
+        )
+
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def test_join_key_change_uses_new_entry(
+        self, transaction_source, tmp_path, source_schema
+    ):
+        def _make_table(join_keys):
+            table = core.FeatureTable(
+                name="persisted_keys",
+                source=transaction_source,
+                entity=core.Entity(name="user", join_keys=join_keys),
+                timestamp_field="event_timestamp",
+            )
+            table.aggregate(
+                name="spend_7d",
+                field=_FIELD_F64,
+                column="amount",
+                function="sum",
+                window=_D7,
+            )
+            return table
+
+        ibis_compiler = compiler.IbisCompiler(persistent_cache_dir=tmp_path)
+        ibis_compiler.compile_table(
+            _make_table(["user_id"]), source_schema=source_schema
+        )
+        (entry,) = tmp_path.glob("*.json")
+        data = json.loads(entry.read_text())
+        entry.write_text(json.dumps({**data, "sql": "SELECT 1"}))
+        compiler.clear_compile_cache()
+
+        result = ibis_compiler.compile_table(
+            _make_table(["user_id", "merchant_id"]),
+            source_schema=source_schema,
+        )
+
+        assert result.sql != "SELECT 1"
+        assert "merchant_id" in result.sql
+
+    def test_tables_with_transforms_are_not_persisted(
+        self, table, tmp_path, source_schema
+    ):
+        @table.transform()
+        def completed(t):
+            return t.filter(t.status == "completed")
+
+        compiler.IbisCompiler(persistent_cache_dir=tmp_path).compile_table(
+            table, source_schema=source_schema
+        )
+
+        assert list(tmp_path.iterdir()) == []
+
+
 # ---------------------------------------------------------------------------
 # DAG / derived tables
 # ---------------------------------------------------------------------------
@@ -448,10 +782,10 @@ class TestDAGCompilation:
         )
         derived.aggregate(
             name="risk_score",
-            field=core.Field(dtype="float64"),
+            field=_FIELD_F64,
             column="amount",
             function="avg",
-            window=timedelta(days=30),
+            window=_D30,
         )
         result = ibis_compiler.compile_table(derived)
 
@@ -465,32 +799,31 @@ class TestDAGCompilation:
 # ---------------------------------------------------------------------------
 
 
-class TestSchemaInference:
-    def test_infer_schema_from_aggregates(self, feature_table, ibis_compiler):
-        """Compiler should infer schema from aggregate definitions."""
-        feature_table.aggregate(
-            name="spend_90d",
-            field=core.Field(dtype="float64"),
-            column="amount",
-            function="sum",
-            window=timedelta(days=90),
-        )
-        # No source_schema -- rely on inference
-        result = ibis_compiler.compile_table(feature_table)
+@pytest.fixture(scope="class")
+def _inferred_compiled(user_entity, transaction_source, ibis_compiler):
+    """Compile once without a source schema, for every inference test."""
+    table = _make_feature_table(user_entity, transaction_source)
+    table.aggregate(
+        name="spend_90d",
+        field=_FIELD_F64,
+        column="amount",
+        function="sum",
+        window=_D90,
+    )
+    # No source_schema -- rely on inference
+    return ibis_compiler.compile_table(table)
 
-        assert "SUM" in result.sql
-        assert "spend_90d" in result.sql
 
-    def test_infer_schema_includes_join_keys(
-        self, feature_table, ibis_compiler
-    ):
-        feature_table.aggregate(
-            name="spend_90d",
-            field=core.Field(dtype="float64"),
-            column="amount",
-            function="sum",
-            window=timedelta(days=90),
+class TestSchemaInference:
+    def test_infer_schema_from_aggregates(self, _inferred_compiled):
+        """Compiler should infer schema from aggregate definitions."""
+        _assert_contains_all(
+            _inferred_compiled.sql,
+            [
+                "SUM",
+                "spend_90d",
+            ],
         )
-        result = ibis_compiler.compile_table(feature_table)
 
-        assert "user_id" in result.sql
+    def test_infer_schema_includes_join_keys(self, _inferred_compiled):
+        assert "user_id" in _inferred_compiled.sql
@@ -22,35 +22,33 @@ def source():
 
 
 class TestWriteMode:
-    def test_default_is_append(self, entity, source):
-        table = core.FeatureTable(
-            name="test",
-            source=source,
-            entity=entity,
-            timestamp_field="ts",
-        )
-        assert table.write_mode == "append"
-
-    def test_merge_mode(self, entity, source):
-        table = core.FeatureTable(
-            name="test",
-            source=source,
-            entity=entity,
-            timestamp_field="ts",
-            write_mode="merge",
-        )
-        assert table.write_mode == "merge"
+    @pytest.mark.parametrize(
+        ("mode", "expected", "raises"),
+        [
+            (None, "append", False),
+            ("merge", "merge", False),
+            ("invalid", None, True),
+        ],
+        ids=["default_is_append", "merge_mode", "invalid_mode_rejected"],
+    )
+    def test_write_mode(self, entity, source, mode, expected, raises):
+        kwargs = {} if mode is None else {"write_mode": mode}
 
-    def test_invalid_mode_rejected(self, entity, source):
-        with pytest.raises(Exception):
-            core.FeatureTable(
+        def _make_table():
+            return core.FeatureTable(
                 name="test",
                 source=source,
                 entity=entity,
                 timestamp_field="ts",
-                write_mode="invalid",
+                **kwargs,
             )
 
+        if raises:
+            with pytest.raises(Exception):
+                _make_table()
+        else:
+            assert _make_table().write_mode == expected
+
 
 class TestMergeKeys:
     def test_default_none(self, entity, source):
@@ -109,6 +109,21 @@ class TestDAGSingleTable:
         assert result == []
 
 
+def _chain(entity, source, length):
+    """Build ``length`` feature tables, each sourcing from the previous."""
+    tables = []
+    for i in range(length):
+        table = core.FeatureTable(
+            name=f"chain_{i:04d}",
+            source=source,
+            entity=entity,
+            timestamp_field="event_timestamp",
+        )
+        tables.append(table)
+        source = table
+    return tables
+
+
 class TestDAGLinearChain:
     def test_linear_chain_topological_sort(
         self, base_table, derived_table, third_table
@@ -130,6 +145,54 @@ class TestDAGLinearChain:
         assert result.index("base_features") < result.index("derived_features")
         assert result.index("derived_features") < result.index("third_features")
 
+    def test_long_chain_sorts_in_dependency_order(
+        self, user_entity, batch_source
+    ):
+        """A long chain added leaf-first still sorts root-first."""
+        tables = _chain(user_entity, batch_source, 200)
+
+        d = dag.DAG()
+        d.add_tables(list(reversed(tables)))
+        assert d.topological_sort() == [t.name for t in tables]
+
+    def test_get_upstream_deeper_than_recursion_limit(
+        self, user_entity, batch_source
+    ):
+        tables = _chain(user_entity, batch_source, 1500)
+
+        d = dag.DAG()
+        d.add_tables(tables)
+        assert d.get_upstream(tables[-1].name) == [t.name for t in tables]
+
+    def test_get_upstream_keeps_unregistered_dependency_first(
+        self, derived_table, third_table
+    ):
+        """A source table missing from the DAG still heads the list."""
+        d = dag.DAG()
+        d.add_tables([derived_table, third_table])
+        assert d.get_upstream("third_features") == [
+            "base_features",
+            "derived_features",
+            "third_features",
+        ]
+
+    def test_get_upstream_sees_tables_added_later(
+        self, base_table, derived_table, third_table
+    ):
+        d = dag.DAG()
+        d.add_tables([base_table, derived_table])
+        assert d.get_downstream("base_features") == [
+            "base_features",
+            "derived_features",
+        ]
+
+        d.add_table(third_table)
+        assert d.get_upstream("third_features") == [
+            "base_features",
+            "derived_features",
+            "third_features",
+        ]
+
     def test_get_upstream_of_leaf(self, base_table, derived_table, third_table):
         d = dag.DAG()
         d.add_tables([base_table, derived_table, third_table])
@@ -284,6 +347,48 @@ class TestDAGCycleDetection:
         assert "beta" in str(exc_info.value)
         assert "Remove circular dependencies" in str(exc_info.value)
 
+    def test_cycle_error_omits_tables_downstream_of_cycle(
+        self, user_entity, batch_source
+    ):
+        """Only tables on the cycle are named, as a closed path."""
+        tables = _chain(user_entity, batch_source, 3)
+
+        d = dag.DAG()
+        d.add_tables(tables)
+
+        # Close chain_0000 -> chain_0001; chain_0002 only depends on it
+        d._nodes["chain_0000"].upstream.append("chain_0001")
+        d._nodes["chain_0001"].downstream.append("chain_0000")
+
+        with pytest.raises(errors.StrataError) as exc_info:
+            d.topological_sort()
+
+        message = str(exc_info.value)
+        assert "chain_0000 -> chain_0001 -> chain_0000" in message
+        assert "chain_0002" not in message
+
+    def test_queries_away_from_cycle_still_answer(
+        self, user_entity, batch_source, base_table, derived_table
+    ):
+        d = dag.DAG()
+        d.add_tables(_chain(user_entity, batch_source, 3))
+        d.add_tables([base_table, derived_table])
+        d._nodes["chain_0000"].upstream.append("chain_0001")
+        d._nodes["chain_0001"].downstream.append("chain_0000")
+
+        assert d.get_upstream("derived_features") == [
+            "base_features",
+            "derived_features",
+        ]
+        assert d.get_downstream("base_features", include_self=False) == [
+            "derived_features"
+        ]
+        assert d.get_upstream("chain_0002") == [
+            "chain_0000",
+            "chain_0001",
+            "chain_0002",
+        ]
+
 
 class TestDAGTableNotFound:
     def test_get_upstream_unknown_table_raises_error(self, base_table):
@@ -361,6 +466,28 @@ class TestDAGNodeProperties:
         node = d.nodes["base_features"]
         assert "derived_features" in node.downstream
 
+    def test_downstream_not_duplicated(self, base_table, derived_table):
+        """Re-adding a dependent does not repeat it in downstream."""
+        d = dag.DAG()
+        d.add_tables([base_table, derived_table])
+        d.add_tables([derived_table])
+        node = d.nodes["base_features"]
+        assert node.downstream == ["derived_features"]
+
+    def test_nodes_view_is_read_only(self, base_table):
+        d = dag.DAG()
+        d.add_table(base_table)
+        with pytest.raises(TypeError):
+            d.nodes["other"] = d.nodes["base_features"]
+        assert len(d) == 1
+
+    def test_nodes_view_sees_later_tables(self, base_table, derived_table):
+        d = dag.DAG()
+        d.add_table(base_table)
+        nodes = d.nodes
+        d.add_table(derived_table)
+        assert nodes["derived_features"].upstream == ["base_features"]
+
     def test_root_node_has_no_upstream(self, base_table):
         d = dag.DAG()
         d.add_table(base_table)
@@ -422,3 +549,25 @@ class TestDAGMultipleRoots:
         result = d.topological_sort()
         assert result.index("table_a") < result.index("table_c")
         assert len(result) == 3
+
+
+class TestDAGOrderCache:
+    def test_returned_order_is_a_copy(self, base_table, derived_table):
+        d = dag.DAG()
+        d.add_tables([base_table, derived_table])
+        d.topological_sort().clear()
+        assert d.topological_sort() == ["base_features", "derived_features"]
+
+    def test_add_table_refreshes_order(
+        self, base_table, derived_table, third_table
+    ):
+        d = dag.DAG()
+        d.add_tables([base_table, derived_table])
+        assert d.topological_sort() == ["base_features", "derived_features"]
+
+        d.add_table(third_table)
+        assert d.topological_sort() == [
+            "base_features",
+            "derived_features",
+            "third_features",
+        ]
@@ -54,6 +54,32 @@ class TestDataset:
         tables = dataset.tables_referenced()
         assert tables == {"user_transactions", "customer_features"}
 
+    def test_output_columns_follow_field_reassignment(self, feature_refs):
+        dataset = core.Dataset(name="fraud_detection", features=feature_refs)
+        assert dataset.output_columns()[0] == "user_transactions__spend_90d"
+
+        dataset.prefix_features = False
+        assert dataset.output_columns()[0] == "spend_90d"
+
+    def test_output_columns_follow_model_copy(self, feature_refs):
+        dataset = core.Dataset(name="fraud_detection", features=feature_refs)
+        dataset.output_columns()
+
+        copied = dataset.model_copy(update={"prefix_features": False})
+        assert copied.output_columns()[0] == "spend_90d"
+
+    def test_tables_referenced_follow_in_place_edits(self, feature_refs):
+        dataset = core.Dataset(
+            name="fraud_detection", features=list(feature_refs[:1])
+        )
+        assert dataset.tables_referenced() == {"user_transactions"}
+
+        dataset.features.append(feature_refs[2])
+        assert dataset.tables_referenced() == {
+            "user_transactions",
+            "customer_features",
+        }
+
     def test_rejects_duplicate_output_columns(self):
         refs = [
             core.Feature(name="amount", table_name="table1"),
@@ -77,6 +77,58 @@ class TestComputeDiff:
         assert len(result.updates) == 0
         assert len(result.deletes) == 0
         assert len(result.unchanged) == 1
+        assert result.unchanged_count == 1
+        assert result.unchanged[0].spec_json == spec_json
+
+    def test_iter_changes_yields_lazily(self):
+        entity = core.Entity(name="user", join_keys=["user_id"])
+        discovered = (
+            discovery.DiscoveredObject(
+                kind="entity",
+                name=name,
+                obj=entity,
+                source_file="entities/user.py",
+            )
+            for name in ("user", "other")
+        )
+        stale = registry.ObjectRecord(
+            kind="entity", name="gone", spec_hash="x", spec_json="{}", version=1
+        )
+
+        changes = diff.iter_changes(discovered, FakeRegistry([stale]))
+
+        first = next(changes)
+        assert first.operation == diff.ChangeOperation.CREATE
+        assert first.name == "user"
+        assert [c.operation for c in changes] == [
+            diff.ChangeOperation.CREATE,
+            diff.ChangeOperation.DELETE,
+        ]
+
+    def test_in_place_edit_seen_by_next_diff(self):
+        """Specs are cached per diff only, so nested edits are detected."""
+        entity = core.Entity(name="user", join_keys=["user_id"])
+        discovered = [
+            discovery.DiscoveredObject(
+                kind="entity",
+                name="user",
+                obj=entity,
+                source_file="entities/user.py",
+            )
+        ]
+        (created,) = diff.compute_diff(discovered, FakeRegistry([])).creates
+        current = registry.ObjectRecord(
+            kind="entity",
+            name="user",
+            spec_hash=created.new_hash,
+            spec_json=created.spec_json,
+            version=1,
+        )
+
+        entity.join_keys.append("tenant_id")
+        result = diff.compute_diff(discovered, FakeRegistry([current]))
+
+        assert len(result.updates) == 1
 
     def test_different_hash_update(self):
         """When spec hash differs, object is updated."""
@@ -196,6 +248,14 @@ class TestComputeDiff:
         assert result.has_changes is True
 
 
+class TestComputeSpecHash:
+    def test_hash_is_stable_across_releases(self):
+        """Registries store these hashes; the algorithm must not drift."""
+        assert registry.compute_spec_hash('{"name":"user"}') == (
+            "5077ee49430b0c34347573ca6d189b29fc98cf15b63b74f82460cf46ac1bb0a5"
+        )
+
+
 class TestDiffResult:
     """Test DiffResult helper methods."""
 
@@ -237,3 +297,20 @@ class TestDiffResult:
         ]
         result = diff.DiffResult(changes=changes)
         assert result.has_changes is False
+        assert result.unchanged_count == 1
+
+    def test_summary_lists_operations_in_display_order(self):
+        changes = [
+            diff.Change(operation=operation, kind="entity", name=f"e{i}")
+            for i, operation in enumerate(
+                [
+                    diff.ChangeOperation.UNCHANGED,
+                    diff.ChangeOperation.DELETE,
+                    diff.ChangeOperation.CREATE,
+                ]
+            )
+        ]
+        result = diff.DiffResult(changes=changes)
+
+        assert result.has_changes is True
+        assert result.summary() == "1 created, 1 deleted, 1 unchanged"
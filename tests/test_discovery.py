@@ -1,35 +1,137 @@
 """Tests for feature definition discovery and serialization."""
 
 from datetime import timedelta
+from pathlib import Path
 
 import pytest
 
 import strata.core as core
 import strata.discovery as discovery
+import strata.settings as settings_mod
 import strata.sources as sources
 from strata.infra.backends.local.storage import LocalSourceConfig
 
 
-class TestSerializeEntity:
-    """Test Entity serialization."""
+# Minimal project config without a paths section (smart discovery)
+_BASE_YAML = """
+name: test
+default_env: dev
+environments:
+  dev:
+    registry:
+      kind: sqlite
+      path: .strata/registry.db
+    backend:
+      kind: duckdb
+      path: .strata/data
+      catalog: features
+"""
 
-    def test_serialize_entity_basic(self):
-        entity = core.Entity(name="user", join_keys=["user_id"])
-        spec = discovery.serialize_to_spec(entity, "entity")
 
-        assert spec["name"] == "user"
-        assert spec["join_keys"] == ["user_id"]
-        assert spec["description"] is None
+@pytest.fixture(scope="module")
+def base_settings(tmp_path_factory):
+    """Settings parsed from ``_BASE_YAML`` once per module.
+
+    Tests vary ``paths`` with ``model_copy(update=...)`` instead of
+    writing and re-parsing their own strata.yaml.
+    """
+    config = tmp_path_factory.mktemp("cfg") / "strata.yaml"
+    config.write_text(_BASE_YAML)
+    return settings_mod.load_strata_settings(config)
+
+
+def _entity_module(name: str) -> str:
+    """Source for a module defining a single entity called ``name``."""
+    return (
+        "import strata.core as core\n"
+        f'{name} = core.Entity(name="{name}", join_keys=["id"])\n'
+    )
+
+
+# Canonical project tree shared by the discovery tests. Each location
+# defines a distinct entity so assertions can tell which files were
+# scanned.
+_SKELETON = {
+    "models.py": _entity_module("user"),
+    "src/models/customer.py": _entity_module("customer"),
+    "src/features/account.py": _entity_module("account"),
+    "lib/features/merchant.py": _entity_module("merchant"),
+    "lib/visibility.py": """
+import strata.core as core
+_internal = core.Entity(name="internal", join_keys=["id"])
+public = core.Entity(name="public", join_keys=["id"])
+""",
+    "other/models.py": _entity_module("other_entity"),
+    "entities/driver.py": _entity_module("driver"),
+    "tables/features.py": """
+import strata.core as core
+import strata.sources as sources
+from strata.infra.backends.local.storage import LocalSourceConfig
+
+rider = core.Entity(name="rider", join_keys=["rider_id"])
+batch = sources.BatchSource(
+    name="data",
+    config=LocalSourceConfig(path="./data.parquet"),
+    timestamp_field="ts",
+)
+table = core.FeatureTable(
+    name="rider_features",
+    source=batch,
+    entity=rider,
+    timestamp_field="ts",
+)
+""",
+    "test_models.py": _entity_module("test_entity"),
+    "models_test.py": _entity_module("another_test"),
+    "conftest.py": _entity_module("fixture_entity"),
+    "tests/fixtures.py": _entity_module("test_fixture"),
+    "venv/lib/something.py": _entity_module("venv_entity"),
+    "scratch/experiment.py": _entity_module("scratch_entity"),
+}
+
+
+@pytest.fixture(scope="session")
+def project_skeleton(tmp_path_factory):
+    """Project tree from ``_SKELETON``, written once per session.
+
+    Tests treat it as read-only; one that needs a variant should
+    ``shutil.copytree`` it into its own ``tmp_path`` first.
+    """
+    root = tmp_path_factory.mktemp("project")
+    for rel_path, source in _SKELETON.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    return root
+
+
+def _discover_names(strata_settings, project_root, paths=None) -> set[str]:
+    """Run discovery over ``project_root`` and return the found names."""
+    if paths is not None:
+        strata_settings = strata_settings.model_copy(update={"paths": paths})
+    discoverer = discovery.DefinitionDiscoverer(
+        strata_settings, project_root=project_root
+    )
+    return {obj.name for obj in discoverer.discover_all()}
+
 
-    def test_serialize_entity_with_description(self):
+class TestSerializeEntity:
+    """Test Entity serialization."""
+
+    @pytest.mark.parametrize(
+        "description", [None, "A merchant entity"], ids=["plain", "described"]
+    )
+    def test_serialize_entity(self, description):
         entity = core.Entity(
             name="merchant",
             join_keys=["merchant_id"],
-            description="A merchant entity",
+            description=description,
         )
         spec = discovery.serialize_to_spec(entity, "entity")
 
-        assert spec["description"] == "A merchant entity"
+        assert spec["name"] == "merchant"
+        assert spec["join_keys"] == ["merchant_id"]
+        assert spec["description"] == description
 
 
 class TestSerializeFeatureTable:
@@ -130,6 +232,12 @@ class TestCanonicalJson:
         assert " " not in json_str
         assert "\n" not in json_str
 
+    def test_spec_to_json_escapes_non_ascii(self):
+        """Stored spec hashes depend on non-ASCII text being escaped."""
+        json_str = discovery.spec_to_json({"description": "café"})
+
+        assert json_str == '{"description":"caf\\u00e9"}'
+
 
 class TestDefinitionDiscoverer:
     """Test DefinitionDiscoverer class."""
@@ -138,69 +246,65 @@ class TestDefinitionDiscoverer:
         """DefinitionDiscoverer class should be importable."""
         assert hasattr(discovery, "DefinitionDiscoverer")
 
-    def test_discover_all_returns_list(self, tmp_path, monkeypatch):
+    def test_discover_all_returns_list(self, base_settings, tmp_path):
         """discover_all should return a list of DiscoveredObject."""
-        # Create minimal config
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
+        discoverer = discovery.DefinitionDiscoverer(
+            base_settings, project_root=tmp_path
         )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
         result = discoverer.discover_all()
 
         assert isinstance(result, list)
 
+    def test_discovered_override_short_circuits(self, tmp_path):
+        """discover_definitions returns the override without scanning."""
+        obj = discovery.DiscoveredObject(
+            kind="entity",
+            name="user",
+            obj=core.Entity(name="user", join_keys=["user_id"]),
+            source_file="<override>",
+        )
+
+        token = discovery.discovered_override.set([obj])
+        try:
+            result = discovery.discover_definitions(project_root=tmp_path)
+        finally:
+            discovery.discovered_override.reset(token)
+
+        assert result == [obj]
+
 
 class TestDiscovery:
     """Test module discovery."""
 
-    def test_extract_from_module_finds_entity(self, tmp_path):
-        # Create a Python file with an Entity
-        module_file = tmp_path / "entities" / "user.py"
-        module_file.parent.mkdir(parents=True)
-        module_file.write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
+    def test_extract_from_module_finds_entity(self, project_skeleton):
+        """Smoke test for the on-disk import path."""
+        discoverer = discovery.DefinitionDiscoverer(
+            project_root=project_skeleton
+        )
+        discovered = discoverer._extract_from_module(
+            project_skeleton / "entities" / "driver.py"
         )
 
+        assert len(discovered) == 1
+        assert discovered[0].kind == "entity"
+        assert discovered[0].name == "driver"
+
+    def test_extract_from_source_finds_entity(self, tmp_path):
         discoverer = discovery.DefinitionDiscoverer(project_root=tmp_path)
-        discovered = discoverer._extract_from_module(module_file)
+        discovered = discoverer._extract_from_source(
+            _entity_module("user"), Path("user.py")
+        )
 
         assert len(discovered) == 1
         assert discovered[0].kind == "entity"
         assert discovered[0].name == "user"
+        assert discovered[0].source_file == "user.py"
 
     def test_extract_ignores_private(self, tmp_path):
-        module_file = tmp_path / "test.py"
-        module_file.write_text(
-            """
-import strata.core as core
-_internal = core.Entity(name="internal", join_keys=["id"])
-public = core.Entity(name="public", join_keys=["id"])
-"""
-        )
-
         discoverer = discovery.DefinitionDiscoverer(project_root=tmp_path)
-        discovered = discoverer._extract_from_module(module_file)
+        discovered = discoverer._extract_from_source(
+            _SKELETON["lib/visibility.py"], Path("visibility.py")
+        )
 
         # Should only find public entity
         assert len(discovered) == 1
@@ -208,417 +312,74 @@ public = core.Entity(name="public", join_keys=["id"])
 
 
 class TestSmartDiscovery:
-    """Test smart discovery with include/exclude patterns."""
+    """Test smart discovery with include/exclude patterns.
 
-    def test_discovers_from_any_location(self, tmp_path, monkeypatch):
-        """Smart discovery finds entities anywhere in the project."""
-        # Create entities in non-standard locations
-        (tmp_path / "src" / "models").mkdir(parents=True)
-        (tmp_path / "src" / "models" / "user.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        (tmp_path / "lib" / "features").mkdir(parents=True)
-        (tmp_path / "lib" / "features" / "merchant.py").write_text(
-            """
-import strata.core as core
-merchant = core.Entity(name="merchant", join_keys=["merchant_id"])
-"""
-        )
+    The tests only read the shared skeleton and never change the working
+    directory, so they need no ``xdist_group`` and spread freely across
+    workers.
+    """
 
-        # Create config without paths (uses smart discovery)
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
-        assert "user" in names
+    def test_discovers_from_any_location(self, base_settings, project_skeleton):
+        """Smart discovery finds entities anywhere in the project."""
+        names = _discover_names(base_settings, project_skeleton)
+        assert "customer" in names
         assert "merchant" in names
 
-    def test_excludes_test_files(self, tmp_path, monkeypatch):
+    def test_excludes_test_files(self, base_settings, project_skeleton):
         """Smart discovery excludes test_*.py and *_test.py files."""
-        # Create regular file
-        (tmp_path / "models.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        # Create test files that should be excluded
-        (tmp_path / "test_models.py").write_text(
-            """
-import strata.core as core
-test_entity = core.Entity(name="test_entity", join_keys=["id"])
-"""
-        )
-        (tmp_path / "models_test.py").write_text(
-            """
-import strata.core as core
-another_test = core.Entity(name="another_test", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
+        names = _discover_names(base_settings, project_skeleton)
         assert "user" in names
         assert "test_entity" not in names
         assert "another_test" not in names
 
-    def test_excludes_conftest(self, tmp_path, monkeypatch):
+    def test_excludes_conftest(self, base_settings, project_skeleton):
         """Smart discovery excludes conftest.py files."""
-        # Create regular file
-        (tmp_path / "models.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        # Create conftest.py that should be excluded
-        (tmp_path / "conftest.py").write_text(
-            """
-import strata.core as core
-fixture_entity = core.Entity(name="fixture_entity", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
+        names = _discover_names(base_settings, project_skeleton)
         assert "user" in names
         assert "fixture_entity" not in names
 
-    def test_excludes_tests_directory(self, tmp_path, monkeypatch):
+    def test_excludes_tests_directory(self, base_settings, project_skeleton):
         """Smart discovery excludes **/tests/** directories."""
-        # Create regular file
-        (tmp_path / "src" / "models.py").parent.mkdir(parents=True)
-        (tmp_path / "src" / "models.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        # Create file in tests directory that should be excluded
-        (tmp_path / "tests").mkdir()
-        (tmp_path / "tests" / "fixtures.py").write_text(
-            """
-import strata.core as core
-test_fixture = core.Entity(name="test_fixture", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
-        assert "user" in names
+        names = _discover_names(base_settings, project_skeleton)
+        assert "customer" in names
         assert "test_fixture" not in names
 
-    def test_excludes_venv_directory(self, tmp_path, monkeypatch):
+    def test_excludes_venv_directory(self, base_settings, project_skeleton):
         """Smart discovery excludes venv directories."""
-        # Create regular file
-        (tmp_path / "models.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        # Create file in venv that should be excluded
-        (tmp_path / "venv" / "lib").mkdir(parents=True)
-        (tmp_path / "venv" / "lib" / "something.py").write_text(
-            """
-import strata.core as core
-venv_entity = core.Entity(name="venv_entity", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
+        names = _discover_names(base_settings, project_skeleton)
         assert "user" in names
         assert "venv_entity" not in names
 
-    def test_custom_exclude_patterns(self, tmp_path, monkeypatch):
-        """Custom exclude patterns work."""
-        # Create files
-        (tmp_path / "models.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        (tmp_path / "scratch").mkdir()
-        (tmp_path / "scratch" / "experiment.py").write_text(
-            """
-import strata.core as core
-scratch_entity = core.Entity(name="scratch_entity", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-paths:
-  exclude:
-    - "**/scratch/**"
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
+    def test_scratch_discovered_by_default(
+        self, base_settings, project_skeleton
+    ):
+        """Directories outside the default excludes are scanned."""
+        names = _discover_names(base_settings, project_skeleton)
+        assert "scratch_entity" in names
 
-        names = {obj.name for obj in result}
+    def test_custom_exclude_patterns(self, base_settings, project_skeleton):
+        """Custom exclude patterns work."""
+        paths = settings_mod.SmartPathsSettings(exclude=["**/scratch/**"])
+        names = _discover_names(base_settings, project_skeleton, paths)
         assert "user" in names
         assert "scratch_entity" not in names
 
-    def test_include_restricts_search(self, tmp_path, monkeypatch):
+    def test_include_restricts_search(self, base_settings, project_skeleton):
         """Include patterns restrict search to specific directories."""
-        # Create files in different locations
-        (tmp_path / "src" / "features").mkdir(parents=True)
-        (tmp_path / "src" / "features" / "user.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        (tmp_path / "other" / "models.py").parent.mkdir(parents=True)
-        (tmp_path / "other" / "models.py").write_text(
-            """
-import strata.core as core
-other_entity = core.Entity(name="other_entity", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-paths:
-  include:
-    - src/features/
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
-        assert "user" in names
+        paths = settings_mod.SmartPathsSettings(include=["src/features/"])
+        names = _discover_names(base_settings, project_skeleton, paths)
+        assert "account" in names
         assert "other_entity" not in names
 
-    def test_legacy_mode_still_works(self, tmp_path, monkeypatch):
+    def test_legacy_mode_still_works(self, base_settings, project_skeleton):
         """Legacy paths configuration still works."""
-        # Create files in legacy structure
-        (tmp_path / "entities").mkdir()
-        (tmp_path / "entities" / "user.py").write_text(
-            """
-import strata.core as core
-user = core.Entity(name="user", join_keys=["user_id"])
-"""
-        )
-        (tmp_path / "tables").mkdir()
-        (tmp_path / "tables" / "features.py").write_text(
-            """
-import strata.core as core
-import strata.sources as sources
-from strata.infra.backends.local.storage import LocalSourceConfig
-
-user = core.Entity(name="user", join_keys=["user_id"])
-batch = sources.BatchSource(
-    name="data",
-    config=LocalSourceConfig(path="./data.parquet"),
-    timestamp_field="ts",
-)
-table = core.FeatureTable(
-    name="user_features",
-    source=batch,
-    entity=user,
-    timestamp_field="ts",
-)
-"""
-        )
-        # Create file outside legacy paths (should not be discovered)
-        (tmp_path / "other.py").write_text(
-            """
-import strata.core as core
-other = core.Entity(name="other", join_keys=["id"])
-"""
-        )
-
-        config = tmp_path / "strata.yaml"
-        config.write_text(
-            """
-name: test
-default_env: dev
-paths:
-  tables: tables/
-  datasets: datasets/
-  entities: entities/
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: features
-"""
-        )
-        monkeypatch.chdir(tmp_path)
-        import strata.settings as settings_mod
-
-        strata_settings = settings_mod.load_strata_settings()
-
-        # Verify legacy settings type
-        assert isinstance(
-            strata_settings.paths, settings_mod.LegacyPathsSettings
-        )
-
-        discoverer = discovery.DefinitionDiscoverer(strata_settings)
-        result = discoverer.discover_all()
-
-        names = {obj.name for obj in result}
-        # User from entities/ and from tables/
-        assert "user" in names
-        assert "user_features" in names
-        # Other should NOT be found (outside legacy paths)
-        assert "other" not in names
+        paths = settings_mod.LegacyPathsSettings(
+            tables="tables/", datasets="datasets/", entities="entities/"
+        )
+        names = _discover_names(base_settings, project_skeleton, paths)
+        # Driver from entities/, rider and its table from tables/
+        assert "driver" in names
+        assert "rider" in names
+        assert "rider_features" in names
+        # Root-level models should NOT be found (outside legacy paths)
+        assert "user" not in names
@@ -11,6 +11,23 @@ import strata.errors as errors
 import strata.settings as settings
 
 
+# ``paths`` blocks appended to ``valid_config`` by the paths tests
+_SMART_PATHS_YAML = """
+paths:
+  include:
+    - src/features/
+  exclude:
+    - "**/scratch/**"
+"""
+
+_MIXED_PATHS_YAML = """
+paths:
+  tables: tables/
+  include:
+    - src/
+"""
+
+
 @pytest.fixture
 def valid_config() -> str:
     """Minimal valid configuration."""
@@ -138,6 +155,52 @@ environments:
 
         assert "default_env" in str(exc_info.value)
 
+    def test_reloads_return_independent_instances(
+        self, full_config: str, tmp_path: Path
+    ) -> None:
+        """Cached parses still give each caller its own active env."""
+        path = tmp_path / "strata.yaml"
+        path.write_text(full_config)
+
+        dev = settings.load_strata_settings(path, env="dev")
+        prd = settings.load_strata_settings(path, env="prd")
+
+        assert dev is not prd
+        assert dev.active_env == "dev"
+        assert prd.active_env == "prd"
+
+    def test_edited_config_is_reparsed(
+        self, valid_config: str, tmp_path: Path
+    ) -> None:
+        """Changing strata.yaml invalidates the cached parse."""
+        path = tmp_path / "strata.yaml"
+        path.write_text(valid_config)
+        assert settings.load_strata_settings(path).name == "test-project"
+
+        path.write_text(valid_config.replace("test-project", "renamed"))
+
+        assert settings.load_strata_settings(path).name == "renamed"
+
+    def test_env_interpolation_resolved_per_load(
+        self, valid_config: str, tmp_path: Path, monkeypatch
+    ) -> None:
+        """${oc.env:...} values follow the environment, not the cache."""
+        path = tmp_path / "strata.yaml"
+        path.write_text(
+            valid_config.replace(
+                "catalog: test_catalog", "catalog: ${oc.env:STRATA_CATALOG}"
+            )
+        )
+
+        monkeypatch.setenv("STRATA_CATALOG", "first")
+        first = settings.load_strata_settings(path)
+        monkeypatch.setenv("STRATA_CATALOG", "second")
+        second = settings.load_strata_settings(path)
+
+        assert first.active_environment.backend.catalog == "first"
+        assert second.active_environment.backend.catalog == "second"
+        assert first.environments is not second.environments
+
 
 class TestEnvironmentResolution:
     """Tests for environment resolution."""
@@ -259,30 +322,12 @@ class TestPathsConfiguration:
         assert config.paths.datasets == "features/datasets/"
         assert config.paths.entities == "features/entities/"
 
-    def test_smart_paths_with_include_exclude(self) -> None:
+    def test_smart_paths_with_include_exclude(self, valid_config: str) -> None:
         """Smart paths with include/exclude use SmartPathsSettings."""
-        config_str = """
-name: test-project
-default_env: dev
-paths:
-  include:
-    - src/features/
-  exclude:
-    - "**/scratch/**"
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: test_catalog
-"""
         with tempfile.NamedTemporaryFile(
             mode="w", suffix=".yaml", delete=False
         ) as f:
-            f.write(config_str)
+            f.write(valid_config + _SMART_PATHS_YAML)
             f.flush()
             config = settings.load_strata_settings(Path(f.name))
 
@@ -290,29 +335,14 @@ environments:
         assert config.paths.include == ["src/features/"]
         assert config.paths.exclude == ["**/scratch/**"]
 
-    def test_mixing_legacy_and_smart_paths_raises_error(self) -> None:
+    def test_mixing_legacy_and_smart_paths_raises_error(
+        self, valid_config: str
+    ) -> None:
         """Mixing legacy and smart paths raises ConfigValidationError."""
-        config_str = """
-name: test-project
-default_env: dev
-paths:
-  tables: tables/
-  include:
-    - src/
-environments:
-  dev:
-    registry:
-      kind: sqlite
-      path: .strata/registry.db
-    backend:
-      kind: duckdb
-      path: .strata/data
-      catalog: test_catalog
-"""
         with tempfile.NamedTemporaryFile(
             mode="w", suffix=".yaml", delete=False
         ) as f:
-            f.write(config_str)
+            f.write(valid_config + _MIXED_PATHS_YAML)
             f.flush()
             with pytest.raises(errors.ConfigValidationError) as exc_info:
                 settings.load_strata_settings(Path(f.name))
@@ -125,6 +125,23 @@ class TestSqliteRegistryObjects:
         result = reg.list_objects()
         assert len(result) == 2
 
+    def test_list_objects_maps_columns_to_fields(self, tmp_path):
+        """Records come back with every field in its own slot."""
+        db_path = tmp_path / "test.db"
+        reg = sqlite.SqliteRegistry(path=str(db_path))
+        reg.initialize()
+
+        obj = registry.ObjectRecord(
+            kind="entity",
+            name="user",
+            spec_hash="abc",
+            spec_json='{"name":"user"}',
+            version=1,
+        )
+        reg.put_object(obj, applied_by="test@host")
+
+        assert reg.list_objects(kind="entity") == [obj]
+
     def test_list_objects_by_kind(self, tmp_path):
         """List can filter by kind."""
         db_path = tmp_path / "test.db"